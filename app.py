@@ -1,45 +1,40 @@
 import streamlit as st
-import openai
 import os
-from fpdf import FPDF
-from fpdf.enums import XPos, YPos
-import matplotlib.pyplot as plt
-from io import BytesIO
+import uuid
 from dotenv import load_dotenv
-import time
-import base64
 
 # --- Load API Key ---
+# core.* 모듈 중 일부는 import 할 때 환경 변수를 읽으므로 .env 를 먼저 불러옴
 load_dotenv()
-openai.api_key = os.getenv("OPENAI_API_KEY")
+
+# openai / fpdf / matplotlib 을 쓰는 모듈은 필요할 때 import (첫 화면을 빨리 그리도록)
+from core.cache import ReportCache
+from core.chat import ChatSession
+from core.jobs import JobQueue, QueueFull
+from core.languages import LANGUAGE_PROFILES, available_languages
+from core.metrics import MetricsStore
+from core.risk import score_risks
+from core.stages import StageTracker
 
 # --- App UI ---
 st.set_page_config(page_title="Patient-Friendly AI Assistant", layout="wide")
 st.title("🩺 Patient-Friendly AI Assistant")
 
-pdf_file = "project_report.pdf"
-# PDF 읽기
-with open(pdf_file, "rb") as f:
-    pdf_bytes = f.read()
-# base64 인코딩 (브라우저에서 다운로드 가능하게)
-b64_pdf = base64.b64encode(pdf_bytes).decode()
-# 오른쪽 끝 정렬, 작은 글씨, 색상 버튼
-st.markdown(f"""
-    <div style="text-align: right; margin-top: 10px;">
-        <a href="data:application/pdf;base64,{b64_pdf}" download="project_report.pdf">
-            <button style="
-                background-color:#FF5733; 
-                color:white; 
-                padding:0.3em 0.8em; 
-                border:none; 
-                border-radius:5px; 
-                cursor:pointer; 
-                font-size:12px;">
-                📄 프로젝트 요약 보고서 다운로드해서 읽기
-            </button>
-        </a>
-    </div>
-""", unsafe_allow_html=True)
+# --- 프로젝트 요약 보고서 (프로세스당 한 번만 읽고 모든 세션/재실행에서 재사용) ---
+@st.cache_resource
+def load_project_report(path="project_report.pdf"):
+    with open(path, "rb") as f:
+        return f.read()
+
+# 오른쪽 끝 정렬 다운로드 버튼 (data: URI 로 페이지에 인라인하지 않고 클릭 시에만 전송)
+_, report_col = st.columns([4, 1])
+report_col.download_button(
+    "📄 프로젝트 요약 보고서 다운로드해서 읽기",
+    load_project_report(),
+    file_name="project_report.pdf",
+    mime="application/pdf",
+    type="primary",
+)
 
 st.markdown("내외국인 환자와의 원활한 소통을 지원하는 스마트 의료 도구 \n\n 1. 왼쪽 상단 >> 을 클릭하세요. \n 2. 샘플 예시 메모를 선택하거나 직접 입력하세요. \n 3. 리포트 생성하기를 클릭하세요.")
 
@@ -92,229 +87,310 @@ if note_choice and note_choice != "예시 메모 선택":
 else:
     doctor_note_text = st.sidebar.text_area("또는 의사 메모를 직접 입력하세요:", height=300)
 
-# --- Risk Keywords & Conditions ---
-risk_keywords = {
-    "hypertension": {"high": ["stage 2", "severe", "crisis"], "moderate": ["elevated", "stage 1"], "low": ["borderline"]},
-    "diabetes": {"high": ["hba1c >9", "insulin"], "moderate": ["hba1c 7-9", "metformin"], "low": ["prediabetes"]},
-    "hyperlipidemia": {"high": ["ldl >190"], "moderate": ["ldl 130-189"], "low": ["borderline cholesterol"]},
-    "asthma": {"high": ["status asthmaticus", "severe"], "moderate": ["moderate"], "low": ["mild"]},
-    "obesity": {"high": ["bmi >35"], "moderate": ["bmi 30-35"], "low": ["bmi 25-30"]},
-}
-
-# --- Helper: sanitize text for Streamlit & PDF ---
-def sanitize_text(text):
-    return ''.join(
-        c if ('\u0000' <= c <= '\u007F') or ('\uAC00' <= c <= '\uD7AF') or c in ".,!?()-/:%" else ' '
-        for c in text
-    )
+# --- 리포트 언어 (영어는 항상 생성하고, 선택한 언어는 영어 결과에서 동시에 번역) ---
+# 폰트 파일이 있는 언어만 선택 가능
+translation_options = [lang for lang in available_languages() if lang != "eng"]
+report_languages = st.sidebar.multiselect(
+    "리포트 언어 (영어는 항상 포함)",
+    translation_options,
+    default=[lang for lang in ("kor",) if lang in translation_options],
+    format_func=lambda lang: LANGUAGE_PROFILES[lang]["tab"],
+)
+
+# --- OpenAI client, generation engine & report cache (shared across sessions) ---
+# 모든 세션이 같은 keep-alive 연결 풀을 사용
+@st.cache_resource
+def get_client():
+    from core.client import make_client
+    return make_client()
+
+@st.cache_resource
+def get_engine():
+    from core.engine import GenerationEngine
+    return GenerationEngine.from_env(client=get_client())
+
+@st.cache_resource
+def get_report_cache():
+    return ReportCache.from_env()
+
+@st.cache_resource
+def get_answer_cache():
+    return ReportCache(path=os.getenv("ANSWER_CACHE_PATH", os.path.join(".cache", "answers.sqlite3")))
+
+# 영어 리포트와 보조 언어마다 작업 하나 (여러 세션이 동시에 여러 언어를 요청해도 대기가 길지 않도록)
+@st.cache_resource
+def get_job_queue():
+    return JobQueue(max_workers=8)
+
+@st.cache_resource
+def get_metrics():
+    return MetricsStore()
+
+# 사용량 집계용 세션 id
+session_id = st.session_state.setdefault("session_id", uuid.uuid4().hex[:8])
+
+# --- 백그라운드 리포트 작업 (스크립트 스레드를 막지 않으므로 생성 중에도 메모 편집 등 위젯 사용 가능) ---
+# 작업 id 는 세션에 보관되어 재실행 후에도 이어서 폴링하고, 끝난 결과는 다시 생성하지 않고 회수
+def submit_primary(report_state):
+    from core.pipeline import GENERATION_MODE, SOURCE_LANGUAGE, generate_report, report_stages
+    # four_call: 영어만 먼저 생성하고 (스트리밍), 보조 언어는 영어가 끝난 뒤 언어별 작업으로 번역
+    # single_call: 선택한 모든 언어를 구조화 응답 한 번으로 생성 (왕복 1회)
+    languages = [SOURCE_LANGUAGE] + (report_state["languages"] if GENERATION_MODE == "single_call" else [])
+    # 작업 스레드가 채우는 진행 상황/스트리밍 텍스트를 폴링 fragment 가 읽어서 표시
+    tracker = report_state["tracker"] = StageTracker(report_stages(languages))
+    streamed = report_state["streamed"] = {"translation": "", "education": ""}
+
+    def collect_delta(lang, section, chunk):
+        # 영어가 캐시되어 있으면 새로 고른 언어가 스트리밍될 수 있는데, 여기에는 영어 탭 내용만 모음
+        if lang == SOURCE_LANGUAGE:
+            streamed[section] += chunk
+
+    # 같은 메모 + 프롬프트 버전 + 모델이면 캐시된 리포트를 그대로 사용
+    # 지난번에 같은 메모로 실패했다면 이미 끝난 섹션은 다시 요청하지 않음
+    partial = st.session_state.pop("partial", {})
+    try:
+        report_state["jobs"][SOURCE_LANGUAGE] = get_job_queue().submit(
+            generate_report,
+            report_state["note"],
+            languages=languages,
+            engine=get_engine(),
+            cache=get_report_cache(),
+            on_delta=collect_delta,
+            tracker=tracker,
+            partial=partial.get("results") if partial.get("note") == report_state["note"] else None,
+        ).id
+    except Exception as e:
+        # 대기열이 가득 찼거나(QueueFull) 엔진을 만들지 못함: 오류로 남겨서 다시 생성하기로 재시도
+        report_state["errors"][SOURCE_LANGUAGE] = str(e)
+        if partial:
+            st.session_state.partial = partial
+
+def has_outcome(report_state, lang):
+    """True once the job for `lang` has been collected into a result or an error."""
+    from core.pipeline import SOURCE_LANGUAGE
+    if lang in report_state["errors"]:
+        return True
+    return report_state["primary"] is not None if lang == SOURCE_LANGUAGE else lang in report_state["secondary"]
+
+def collect_job(report_state, lang):
+    """Move a finished job's outcome into the session; False while it is still queued or running."""
+    from core.engine import GenerationError
+    from core.pipeline import SOURCE_LANGUAGE, generate_report
+    job = get_job_queue().get(report_state["jobs"][lang])
+    if job is not None and job.status in ("queued", "running"):
+        return False
+    del report_state["jobs"][lang]
+    if job is None:
+        report_state["errors"][lang] = "report job expired, please generate again"
+    elif job.status == "failed":
+        report_state["errors"][lang] = job.error
+        if isinstance(job.exception, GenerationError) and job.exception.partial:
+            st.session_state.partial = {"note": report_state["note"], "results": job.exception.partial}
+    elif lang == SOURCE_LANGUAGE:
+        report_state["primary"] = job.result
+        report_state["metrics_id"] = get_metrics().record_report(job.result, get_engine().model, session=session_id)
+        report_state["timings"] = report_state["tracker"].summary()
+        report_state["elapsed"] = job.finished - job.created
+        # 보조 언어는 캐시된 영어 결과를 번역하므로 영어가 끝난 뒤에 언어별 작업으로 동시에 시작
+        # (언어를 더 골라도 각 탭이 기다리는 시간은 늘지 않음). single_call 이면 이미 같은 결과에 들어 있음
+        for secondary in report_state["languages"]:
+            if secondary in job.result.sections:
+                report_state["secondary"][secondary] = job.result
+                continue
+            try:
+                report_state["jobs"][secondary] = get_job_queue().submit(
+                    generate_report, report_state["note"], languages=[secondary], engine=get_engine(),
+                    cache=get_report_cache(),
+                ).id
+            except QueueFull as e:
+                # 이 언어만 오류로 표시하고 영어 리포트와 나머지 언어는 그대로 진행
+                report_state["errors"][secondary] = str(e)
+    else:
+        report_state["secondary"][lang] = job.result
+        get_metrics().record_report(
+            job.result, get_engine().model, session=session_id, report_id=report_state["metrics_id"], languages=[lang]
+        )
+    return True
+
+# 영어 탭: 단계 완료 진행률과 지금까지 스트리밍된 텍스트를 주기적으로 다시 그림
+@st.fragment(run_every=0.5)
+def show_primary_progress(report_state, lang):
+    # 완료되면 결과를 세션에 옮기고 전체를 다시 그려서 폴링을 멈춤
+    # (작업도 결과도 없으면 다시 그려도 달라지지 않으므로 재실행하지 않음)
+    if lang not in report_state["jobs"]:
+        if has_outcome(report_state, lang):
+            st.rerun()
+        return
+    if collect_job(report_state, lang):
+        st.rerun()
+    ui = LANGUAGE_PROFILES[lang]["ui"]
+    tracker = report_state["tracker"]
+    finished = tracker.summary()
+    st.progress(tracker.fraction, text=f"{finished[-1][0]} ✓" if finished else "생성중... ⏳")
+    st.subheader(ui["explanation"])
+    st.markdown(report_state["streamed"]["translation"])
+    st.subheader(ui["education"])
+    st.markdown(report_state["streamed"]["education"])
+
+# 보조 언어 탭: 영어 리포트가 나온 뒤 언어별로 백그라운드에서 동시에 생성
+@st.fragment(run_every=1.0)
+def show_secondary_progress(report_state, lang):
+    if lang not in report_state["jobs"]:
+        if has_outcome(report_state, lang):
+            st.rerun()
+        return
+    if collect_job(report_state, lang):
+        st.rerun()
+    st.info(LANGUAGE_PROFILES[lang]["ui"]["generating"])
+
+# --- Detected conditions & risk levels (같은 위험 점수 조합이면 렌더링된 PNG 재사용) ---
+def show_risk_chart(note, lang):
+    from core.chart import risk_chart_png
+    ui = LANGUAGE_PROFILES[lang]["ui"]
+    st.subheader(ui["chart"])
+    scores = score_risks(note)
+    if scores:
+        st.image(risk_chart_png(scores, lang))
+    else:
+        st.info(ui["no_risk"])
+
+# --- Follow-up Q&A (대화 기록은 세션에 보관되어 재실행 후에도 유지) ---
+def show_chat(report_state, lang):
+    ui = LANGUAGE_PROFILES[lang]["ui"]
+    st.subheader(ui["chat"])
+    chat = report_state["chat"].get(lang)
+    if chat is None:
+        report = report_state["primary"] if lang == SOURCE_LANGUAGE else report_state["secondary"][lang]
+        chat = report_state["chat"][lang] = ChatSession(report_state["note"], report.sections[lang]["translation"], lang)
+
+    log = st.container()
+    for message in chat.history:
+        log.chat_message(message["role"]).markdown(message["content"])
+    with st.form(f"chat_{lang}", clear_on_submit=True):
+        question = st.text_input(ui["chat_label"])
+        asked = st.form_submit_button(ui["chat_button"])
+
+    if asked and question.strip():
+        log.chat_message("user").markdown(question)
+        placeholder = log.chat_message("assistant").empty()
+        streamed = {"text": ""}
+
+        def show_delta(chunk):
+            streamed["text"] += chunk
+            placeholder.markdown(streamed["text"])
+
+        engine = get_engine()
+        answer = chat.ask(
+            engine, question.strip(), cache=get_answer_cache(), on_delta=show_delta,
+            on_usage=lambda usage: get_metrics().record("chat", lang, engine.model, session=session_id, **usage),
+        )
+        placeholder.markdown(answer)
 
 # --- Button Action ---
 if st.button("리포트 생성하기 🩺"):
     if not doctor_note_text.strip():
         st.error("Doctor's note 를 먼저 기입해주세요.")
     else:
-        with st.spinner("생성중... ⏳"):
-            try:
-                # --- AI Prompts ---
-                translation_eng_prompt = f"""Based on the following Korean doctor's note, provide a patient-friendly English explanation for the foreign patient in a **clear, bullet point list format**.
-                
-                                    Requirements:
-                                    1. Present each point as a separate item for clarity.
-                                    2. Explain medical terms in simple language. And it should be **5-7 sentences long** to provide sufficient detail., e.g.,
-                                    - Instead of just "eGFR", write "eGFR (estimated Glomerular Filtration Rate), which indicates how well the kidneys are working".
-                                    3. Describe why each treatment or medication is suggested. And it should be **5-7 sentences long** to provide sufficient detail.
-                                    - The name of the drug.
-                                    - A simple explanation of what it is for (e.g., "Amlodipine: helps lower blood pressure to reduce strain on the heart").
-                                    - Potential side effects the patient should watch for.
-                                    4. Keep the tone concise, clear, and patient-focused, suitable for direct display in a PDF.
-
-                                    Patient note: {doctor_note_text}
-                                    """
-                edu_eng_prompt = f"""Based on the following Korean doctor's note, provide a patient-friendly English potential risk, guidance for the foreign patient in a **clear, bullet point list format**.
-                                    Do not provide any explantion about doctor's note.
-                
-                                    Requirements:
-                                    1. Present each point as a separate item for clarity and must reference and cite public health statistics data from WHO or CDC or open data. Reference FDI World Dental Federation if Doctor's Note related to dental.
-                                    2. Highlight potential risks related to the patient's conditions that are not immediately obvious in **5-7 sentences long** to provide sufficient detail.
-                                    3. Include practical, actionable daily diet tips and lifestyle guidance or work out routines tailored to this patient's conditions, lab results, and age that the patient might not already know **5-7 sentences long** to provide sufficient detail.
-                                    4. Explanations of why certain treatments or lifestyle changes are recommended **3-5 sentences long** to provide sufficient detail.
-                                    5. Keep the tone concise, clear, and patient-focused, suitable for direct display in a PDF.
-
-                                    Patient note: {doctor_note_text}
-                                    """
-
-                # --- Progress simulation ---
-                progress = st.progress(0)
-                for i in range(20, 101, 20):
-                    time.sleep(0.2)
-                    progress.progress(i)
-
-                # --- OpenAI API calls ---
-                translation_eng = openai.chat.completions.create(
-                    model="gpt-3.5-turbo",
-                    messages=[{"role": "user", "content": translation_eng_prompt}]
-                ).choices[0].message.content.strip()
-
-                edu_eng = openai.chat.completions.create(
-                    model="gpt-3.5-turbo",
-                    messages=[{"role": "user", "content": edu_eng_prompt}]
-                ).choices[0].message.content.strip()
-
-                # --- Sanitize AI outputs for Streamlit display ---
-                translation_eng_safe = sanitize_text(translation_eng)
-                edu_eng_safe = sanitize_text(edu_eng)
-
-                tab1, tab2 = st.tabs(["🇺🇸 English", "🇰🇷 Korean"])
-
-                with tab1:
-                    # --- Display Translations & Awareness ---
-                    st.markdown("""
-                                <p style='text-align:center; color: gray; font-size:14px;'>
-                                Disclaimer: This report is for educational purposes only and not a substitute for professional medical advice.
-                                </p>
-                                """, unsafe_allow_html=True)   
-                    st.subheader("✅ Patient-Friendly Explanation")
-                    st.write(translation_eng_safe)
-                    st.subheader("📖 Awareness & Education")
-                    st.write(edu_eng_safe)
-
-                    # --- PDF Export (same as before) ---
-                    pdf = FPDF()
-                    pdf.add_page()
-                    pdf.add_font("DejaVu", "", "fonts/DejaVuSans.ttf")
-                    pdf.add_font("DejaVu", "B", "fonts/DejaVuSans-Bold.ttf")
-                    pdf.add_font("DejaVu", "I", "fonts/DejaVuSans-Oblique.ttf")
-                    pdf.add_font("DejaVu", "BI", "fonts/DejaVuSans-BoldOblique.ttf")
-                    pdf.set_font("DejaVu", size=14)     
-                    pdf.set_text_color(0, 51, 102)
-                    pdf.cell(0, 12, "Patient Report", new_x=XPos.LMARGIN, new_y=YPos.NEXT, align="C")
-                    pdf.ln(8)    
-
-                    pdf.set_font("DejaVu", size=14, style="B")
-                    pdf.cell(0, 10, "Patient-Friendly Translation", new_x=XPos.LMARGIN, new_y=YPos.NEXT, align="C")
-                    pdf.set_font("DejaVu", size=12)
-                    pdf.multi_cell(0, 8, translation_eng_safe)
-                    pdf.ln(4)
-                    pdf.set_font("DejaVu", size=14, style="B")
-                    pdf.cell(0, 10, "Awareness & Education", new_x=XPos.LMARGIN, new_y=YPos.NEXT, align="C")
-                    pdf.set_font("DejaVu", size=12)
-                    pdf.multi_cell(0, 8, edu_eng_safe)
-                    pdf.ln(4)
-
-                    pdf.set_font("DejaVu", size=10, style="I")
-                    pdf.set_text_color(100, 100, 100)
-                    pdf.multi_cell(0, 6, "Disclaimer: This report is for educational purposes only and not a substitute for professional medical advice.")
-                    pdf.ln(3)
-                    pdf.set_font("DejaVu", size=10, style="I")
-                    pdf.set_text_color(120, 120, 120)
-                    page_width = pdf.w - 2 * pdf.l_margin  # page width minus left/right margins
-                    pdf.multi_cell(page_width, 6, "Created by Ha-neul Jung | Data sources: World Health Organization(WHO), Centers for Disease Control and Prevention(CDC), World Dental Federation(FDI) and publicly available medical datasets", align="R")
-                    
-                    pdf_file = "translation_report.pdf"
-                    pdf.output(pdf_file)
-                    with open(pdf_file, "rb") as f:
-                        st.download_button("⬇️ Download Full Report (PDF)", f, file_name="patient_report_eng.pdf")
-
-                    # --- Follow-up Q&A ---
-                    st.subheader("💬 Ask a Question About Your Note")
-                    user_q = st.text_input("Type your question here:")
-                    if st.button("Ask AI"):
-                        if user_q.strip():
-                            q_response = openai.chat.completions.create(
-                                model="gpt-3.5-turbo",
-                                messages=[
-                                    {"role": "system", "content": "You are a helpful medical explainer for patients."},
-                                    {"role": "user", "content": f"Doctor's note: {doctor_note_text}"},
-                                    {"role": "user", "content": f"Patient question: {user_q}"}
-                                ]
-                            )
-                            st.info(sanitize_text(q_response.choices[0].message.content.strip()))
-
-                with tab2:
-                    # Translate into Korean
-                    translation_kor_prompt = f"""Translate the following doctor's note to Korean:\n\n{translation_eng_safe}.
-                                                 Aware that the patient is one person not people, so avoid using '여러분'.
-                                                 And the response format must follow the english format."""
-                    translation_kor = openai.chat.completions.create(
-                        model="gpt-3.5-turbo",
-                        messages=[{"role": "user", "content": translation_kor_prompt}]
-                    ).choices[0].message.content.strip()
-
-                    edu_kor_prompt = f"""Translate the following doctor's note to Korean:\n\n{edu_eng_safe}.
-                                         Aware that the patient is one person not people, so avoid using '여러분'.
-                                         And the response format must follow the english format.
-                                         Translate CDC into 미국질병통제예방센터(CDC), WHO into 세계보건기구(WHO), FDI into 세계치과의사연맹(FDI) if it's mentioned in the note."""
-                    edu_kor = openai.chat.completions.create(
-                        model="gpt-3.5-turbo",
-                        messages=[{"role": "user", "content": edu_kor_prompt}]
-                    ).choices[0].message.content.strip()
-
-                    # --- Sanitize AI outputs for Streamlit display ---
-                    translation_kor_safe = sanitize_text(translation_kor)
-                    edu_kor_safe = sanitize_text(edu_kor)
-
-                    # --- Display Translations & Awareness ---
-                    st.markdown("""
-                                <p style='text-align:center; color: gray; font-size:14px;'>
-                                면책 조항: 이 보고서는 전문적인 의학적 조언을 대신하는 것이 아니라 교육 목적으로만 작성되었습니다.
-                                </p>
-                                """, unsafe_allow_html=True)   
-                    st.subheader("✅ 환자 친화적 설명")
-                    st.write(translation_kor_safe)
-                    st.subheader("📖 환자 교육 및 정보")
-                    st.write(edu_kor_safe)
-
-                    # --- PDF Export (same as before) ---
-                    pdf_kor = FPDF()
-                    pdf_kor.add_page()
-                    pdf_kor.add_font("NotoSansKR", "", "fonts/NotoSansKR-Regular.ttf")
-                    pdf_kor.add_font("NotoSansKR", "B", "fonts/NotoSansKR-Bold.ttf")
-                    pdf_kor.add_font("NotoSansKR", "I", "fonts/NotoSansKR-ExtraLight.ttf")
-                    pdf_kor.set_font("NotoSansKR", size=12)
-                    pdf_kor.set_text_color(0, 51, 102)
-                    pdf_kor.cell(0, 12, "Patient Report", new_x=XPos.LMARGIN, new_y=YPos.NEXT, align="C")
-                    pdf_kor.ln(8)
-
-                    pdf_kor.set_font("NotoSansKR", size=14, style="B")
-                    pdf_kor.cell(0, 10, "환자 친화적 설명", new_x=XPos.LMARGIN, new_y=YPos.NEXT, align="C")
-                    pdf_kor.set_font("NotoSansKR", size=12)
-                    pdf_kor.multi_cell(0, 8, translation_kor_safe)
-                    pdf_kor.ln(4)
-                    pdf_kor.set_font("NotoSansKR", size=14, style="B")
-                    pdf_kor.cell(0, 10, "환자 교육 및 정보", new_x=XPos.LMARGIN, new_y=YPos.NEXT, align="C")
-                    pdf_kor.set_font("NotoSansKR", size=12)
-                    pdf_kor.multi_cell(0, 8, edu_kor_safe)
-                    pdf_kor.ln(4)
-
-                    pdf_kor.set_font("NotoSansKR", size=10, style="I")
-                    pdf_kor.set_text_color(100, 100, 100)
-                    pdf_kor.multi_cell(0, 6, "면책 조항: 이 보고서는 전문적인 의학적 조언을 대신하는 것이 아니라 교육 목적으로만 작성되었습니다.")
-                    pdf_kor.ln(3)
-                    pdf_kor.set_font("NotoSansKR", size=10, style="I")
-                    pdf_kor.set_text_color(120, 120, 120)
-                    page_width = pdf_kor.w - 2 * pdf_kor.l_margin  # page width minus left/right margins
-                    pdf_kor.multi_cell(page_width, 6, "정하늘 작성 | 데이터 출처: 세계보건기구(WHO), 미국질병통제예방센터(CDC), 세계치과의사연맹(FDI)과 공개 의료 데이터셋", align="R")
-
-                    pdf_file_kor = "translation_report_kor.pdf"
-                    pdf_kor.output(pdf_file_kor)
-                    with open(pdf_file_kor, "rb") as f:
-                        st.download_button("⬇️ Download Full Report (PDF)", f, file_name="patient_report_kor.pdf")
-
-                    # --- Follow-up Q&A ---
-                    st.subheader("💬 궁금한 사항을 더 물어보세요")
-                    user_q = st.text_input("질문을 입력해 주세요:")
-                    if st.button("AI에게 물어보기"):
-                        if user_q.strip():
-                            q_response = openai.chat.completions.create(
-                                model="gpt-3.5-turbo",
-                                messages=[
-                                    {"role": "system", "content": "You are a helpful medical explainer for patients."},
-                                    {"role": "user", "content": f"Doctor's note: {doctor_note_text}"},
-                                    {"role": "user", "content": f"Patient question: {user_q}"}
-                                ]
-                            )
-                            st.info(sanitize_text(q_response.choices[0].message.content.strip()))
-
-            except Exception as e:
-                st.error(f"Error: {e}")
-
+        current = st.session_state.get("report")
+        # 같은 메모/언어로 생성 중이거나 이미 생성된 리포트가 있으면 새 작업을 만들지 않음
+        if not (current and current["note"] == doctor_note_text and current["languages"] == report_languages
+                and not current["errors"]):
+            # 리포트는 세션에 보관해서 이후 재실행(탭 폴링, 질문, 메모 편집 등)에서도 유지
+            st.session_state.report = {
+                "note": doctor_note_text, "languages": report_languages,
+                "primary": None, "jobs": {}, "secondary": {}, "errors": {}, "chat": {},
+            }
+            submit_primary(st.session_state.report)
+
+report_state = st.session_state.get("report")
+if report_state:
+    from core.pipeline import SOURCE_LANGUAGE
+
+    try:
+        # 지난 실행 이후 끝난 작업 결과를 먼저 회수 (폴링 fragment 가 돌기 전에 끝났어도 다시 생성하지 않음)
+        for lang in list(report_state["jobs"]):
+            collect_job(report_state, lang)
+
+        # 언어마다 탭 하나 (영어가 첫 번째)
+        report_languages = [SOURCE_LANGUAGE] + report_state["languages"]
+        tabs = dict(zip(report_languages, st.tabs([LANGUAGE_PROFILES[lang]["tab"] for lang in report_languages])))
+        for lang, tab in tabs.items():
+            tab.markdown(
+                "<p style='text-align:center; color: gray; font-size:14px;'>"
+                f"{LANGUAGE_PROFILES[lang]['pdf']['disclaimer']}</p>",
+                unsafe_allow_html=True,
+            )
+
+        source_ui = LANGUAGE_PROFILES[SOURCE_LANGUAGE]["ui"]
+        if SOURCE_LANGUAGE in report_state["errors"]:
+            # 실패한 리포트는 다시 생성하기 클릭 시 재시도
+            with tabs[SOURCE_LANGUAGE]:
+                st.error(f"Error: {report_state['errors'][SOURCE_LANGUAGE]}")
+                if st.session_state.get("partial", {}).get("note") == report_state["note"]:
+                    st.warning("완료된 섹션은 보관했습니다. 다시 생성하면 실패한 섹션만 요청합니다.")
+
+        elif report_state["primary"] is None:
+            # --- Display Translations & Awareness (내용은 생성되는 대로 채워짐) ---
+            with tabs[SOURCE_LANGUAGE]:
+                show_primary_progress(report_state, SOURCE_LANGUAGE)
+
+        else:
+            # --- Display Translations & Awareness ---
+            report = report_state["primary"]
+            with tabs[SOURCE_LANGUAGE]:
+                st.subheader(source_ui["explanation"])
+                st.write(report.sections[SOURCE_LANGUAGE]["translation"])
+                st.subheader(source_ui["education"])
+                st.write(report.sections[SOURCE_LANGUAGE]["education"])
+                show_risk_chart(report_state["note"], SOURCE_LANGUAGE)
+                st.download_button(source_ui["download"], report.pdfs[SOURCE_LANGUAGE],
+                                   file_name=f"patient_report_{SOURCE_LANGUAGE}.pdf")
+
+            for lang in report_state["languages"]:
+                ui = LANGUAGE_PROFILES[lang]["ui"]
+                with tabs[lang]:
+                    if lang in report_state["secondary"]:
+                        lang_report = report_state["secondary"][lang]
+                        st.subheader(ui["explanation"])
+                        st.write(lang_report.sections[lang]["translation"])
+                        st.subheader(ui["education"])
+                        st.write(lang_report.sections[lang]["education"])
+                        show_risk_chart(report_state["note"], lang)
+                        st.download_button(ui["download"], lang_report.pdfs[lang], file_name=f"patient_report_{lang}.pdf")
+                        show_chat(report_state, lang)
+                    elif lang in report_state["errors"]:
+                        st.error(f"Error: {report_state['errors'][lang]}")
+                    else:
+                        show_secondary_progress(report_state, lang)
+
+            # --- 단계별 소요 시간 (영어 리포트 기준) ---
+            with st.expander(f"⏱️ 단계별 소요 시간 (총 {report_state['elapsed']:.2f}s)"):
+                st.table({"stage": [name for name, _ in report_state["timings"]],
+                          "seconds": [round(seconds, 3) for _, seconds in report_state["timings"]]})
+
+            with tabs[SOURCE_LANGUAGE]:
+                show_chat(report_state, SOURCE_LANGUAGE)
+
+    except Exception as e:
+        st.error(f"Error: {e}")
+
+# --- Report cache stats ---
+cache_stats = get_report_cache().stats()
+st.sidebar.caption(f"🗄️ 리포트 캐시: hit {cache_stats['hits']} / miss {cache_stats['misses']} (저장 {cache_stats['entries']}건)")
+
+# --- Token / cost usage (admin only: ADMIN_METRICS=1) ---
+if os.getenv("ADMIN_METRICS") == "1":
+    with st.sidebar.expander("📈 토큰/비용 사용량 (admin)"):
+        metrics = get_metrics()
+        summary = metrics.summary()
+        st.caption(f"리포트 {summary['reports']}건 (전체 캐시 {summary['cached_reports']}건) · LLM 호출 {summary['calls']}회 · "
+                   f"누적 비용 ${summary['cost_usd']:.4f}")
+        col1, col2, col3 = st.columns(3)
+        col1.metric("tokens / report", f"{summary['tokens_per_report']:.0f}")
+        col2.metric("ms / token", f"{summary['ms_per_token']:.1f}")
+        col3.metric("cached prompt", f"{summary['cached_token_rate']:.0%}")
+        st.markdown("**단계/언어/모델별**")
+        st.dataframe(metrics.by("stage", "language", "model"), hide_index=True)
+        st.markdown("**세션별**")
+        st.dataframe(metrics.by("session"), hide_index=True)
+        st.download_button("⬇️ 사용량 CSV 다운로드", metrics.to_csv(), file_name="usage_metrics.csv", mime="text/csv")
@@ -0,0 +1,180 @@
+"""Headless batch report generation for a file of doctor's notes.
+
+    python batch.py notes.csv --out reports/ --concurrency 4 --rpm 60
+
+The input is a CSV with a `note` column (and optionally `id`) or a JSONL file
+with {"id": ..., "note": ...} per line. For every note one PDF per report
+language (--languages, default REPORT_LANGUAGES) is written to the output
+directory as <id>_<lang>.pdf, followed by manifest.json.
+"""
+import argparse
+import csv
+import json
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timezone
+
+import openai
+from dotenv import load_dotenv
+
+# core.pipeline / core.chunking 은 import 할 때 REPORT_LANGUAGES 등을 읽으므로 (--mode, --languages 기본값) .env 를 먼저 불러옴
+load_dotenv()
+
+from core.cache import ReportCache
+from core.client import make_client
+from core.engine import GenerationEngine, GenerationError
+from core.metrics import cost_usd
+from core.pipeline import (
+    GENERATION_MODE,
+    GENERATION_MODES,
+    LANGUAGES,
+    SUPPORTED_LANGUAGES,
+    calls_per_report,
+    generate_report,
+)
+from core.prompts import PROMPT_VERSION, PROMPTS
+from core.ratelimit import RateLimiter
+from core.risk import score_risks
+
+
+def read_notes(path):
+    if path.endswith(".jsonl"):
+        with open(path, encoding="utf-8") as f:
+            rows = [json.loads(line) for line in f if line.strip()]
+    else:
+        with open(path, encoding="utf-8-sig", newline="") as f:
+            rows = list(csv.DictReader(f))
+
+    notes, seen = [], set()
+    for index, row in enumerate(rows, start=1):
+        note = (row.get("note") or "").strip()
+        note_id = re.sub(r"[^\w.-]+", "_", str(row.get("id") or f"{index:04d}"))
+        # 중복 id (정리 후 같아진 "a/1" 과 "a_1" 포함) 는 행 번호를 붙여 PDF 가 서로 덮어쓰지 않도록
+        if note_id in seen:
+            unique_id = f"{note_id}_{index}"
+            while unique_id in seen:
+                unique_id += "_"
+            print(f"duplicate id {note_id!r} in row {index}, writing it as {unique_id!r}")
+            note_id = unique_id
+        seen.add(note_id)
+        notes.append((note_id, note))
+    return notes
+
+
+def process_note(engine, cache, note_id, note, languages, out_dir, retries, mode=None):
+    started = time.perf_counter()
+    entry = {"id": note_id, "status": "ok", "cached": False}
+    if not note:
+        return {**entry, "status": "skipped", "error": "empty note", "seconds": 0.0}
+    entry["risk"] = score_risks(note)
+
+    attempt, partial = 0, None
+    while True:
+        try:
+            report = generate_report(note, languages=languages, engine=engine, cache=cache, mode=mode, partial=partial)
+            break
+        except GenerationError as e:
+            partial = e.partial
+            if not isinstance(e.__cause__, openai.RateLimitError) or attempt >= retries:
+                return {**entry, "status": "failed", "error": str(e), "seconds": round(time.perf_counter() - started, 2)}
+            # 백오프, Retry-After, limiter 정지는 GenerationEngine 이 이미 처리함
+            # 여기서는 끝난 섹션(partial)을 유지한 채 실패한 섹션만 다시 요청
+            attempt += 1
+
+    entry["cached"] = report.cached
+    entry["prompt_tokens"] = sum(usage["prompt_tokens"] for usage in report.usage)
+    entry["cached_tokens"] = sum(usage["cached_tokens"] for usage in report.usage)
+    entry["completion_tokens"] = sum(usage["completion_tokens"] for usage in report.usage)
+    entry["cost_usd"] = round(sum(
+        cost_usd(usage["model"], usage["prompt_tokens"], usage["completion_tokens"], usage["cached_tokens"])
+        for usage in report.usage
+    ), 6)
+    for lang, pdf in report.pdfs.items():
+        path = os.path.join(out_dir, f"{note_id}_{lang}.pdf")
+        with open(path, "wb") as f:
+            f.write(pdf)
+        entry[f"pdf_{lang}"] = os.path.basename(path)
+    return {**entry, "retries": attempt, "seconds": round(time.perf_counter() - started, 2)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate patient reports for a file of doctor's notes.")
+    parser.add_argument("input", help="CSV (with a 'note' column) or JSONL file of notes")
+    parser.add_argument("--out", default="batch_reports", help="output directory for PDFs and manifest.json")
+    parser.add_argument("--concurrency", type=int, default=4, help="notes processed at the same time")
+    parser.add_argument("--rpm", type=int, default=60, help="max OpenAI requests started per minute (0: no limit)")
+    parser.add_argument("--tpm", type=int, default=0, help="max estimated OpenAI tokens per minute (0: no limit)")
+    parser.add_argument("--languages", default=",".join(LANGUAGES), help="comma separated report languages")
+    parser.add_argument("--retries", type=int, default=1,
+                        help="re-runs per note once the engine's per-call retries gave up on a 429 "
+                             "(finished sections are kept, only the failed ones are requested again)")
+    parser.add_argument("--mode", choices=GENERATION_MODES, default=GENERATION_MODE,
+                        help="four_call (one call per section) or single_call (one JSON call per note)")
+    parser.add_argument("--no-cache", action="store_true", help="always regenerate instead of using the report cache")
+    args = parser.parse_args()
+
+    languages = [lang.strip() for lang in args.languages.split(",") if lang.strip()]
+    unknown = [lang for lang in languages if lang not in SUPPORTED_LANGUAGES]
+    if unknown:
+        parser.error(f"unsupported languages: {', '.join(unknown)} (available: {', '.join(SUPPORTED_LANGUAGES)})")
+    notes = read_notes(args.input)
+    os.makedirs(args.out, exist_ok=True)
+    # 동시 실행분만큼 버스트를 허용하되 분당 한도(--rpm)보다 커지지는 않게
+    limiter = RateLimiter(args.rpm, burst=min(args.rpm, max(1, args.concurrency * 2))) if args.rpm else None
+    token_limiter = RateLimiter(args.tpm) if args.tpm else None
+    calls_per_note = calls_per_report(languages)
+    engine = GenerationEngine(
+        client=make_client(max_connections=args.concurrency * calls_per_note),
+        max_workers=args.concurrency * calls_per_note,
+        call_timeout=None,
+        rate_limiter=limiter,
+        token_limiter=token_limiter,
+    )
+    cache = None if args.no_cache else ReportCache.from_env()
+
+    started_at = datetime.now(timezone.utc).isoformat(timespec="seconds")
+    started = time.perf_counter()
+    results = []
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        futures = [
+            pool.submit(process_note, engine, cache, note_id, note, languages, args.out, args.retries, args.mode)
+            for note_id, note in notes
+        ]
+        for done, future in enumerate(as_completed(futures), start=1):
+            entry = future.result()
+            results.append(entry)
+            print(f"[{done}/{len(notes)}] {entry['id']}: {entry['status']} ({entry['seconds']:.1f}s)"
+                  + (f" - {entry['error']}" if entry.get("error") else ""))
+    engine.shutdown()
+    elapsed = time.perf_counter() - started
+
+    succeeded = sum(1 for entry in results if entry["status"] == "ok")
+    notes_per_minute = succeeded / elapsed * 60 if elapsed else 0.0
+    manifest = {
+        "input": os.path.abspath(args.input),
+        "started_at": started_at,
+        "model": engine.model,
+        "prompt_version": PROMPT_VERSION,
+        "prompt_templates": {name: template.version for name, template in PROMPTS.items()},
+        "mode": args.mode,
+        "languages": languages,
+        "notes": len(notes),
+        "succeeded": succeeded,
+        "failed": sum(1 for entry in results if entry["status"] == "failed"),
+        "cached": sum(1 for entry in results if entry.get("cached")),
+        "total_tokens": sum(entry.get("prompt_tokens", 0) + entry.get("completion_tokens", 0) for entry in results),
+        "cost_usd": round(sum(entry.get("cost_usd", 0.0) for entry in results), 6),
+        "elapsed_seconds": round(elapsed, 2),
+        "notes_per_minute": round(notes_per_minute, 2),
+        "reports": sorted(results, key=lambda entry: entry["id"]),
+    }
+    with open(os.path.join(args.out, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+    print(f"{succeeded}/{len(notes)} reports in {elapsed:.1f}s - {notes_per_minute:.1f} notes/minute")
+
+
+if __name__ == "__main__":
+    main()
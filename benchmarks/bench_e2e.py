@@ -0,0 +1,148 @@
+"""End-to-end report latency on the offline mock backend (no API key needed).
+
+Runs generate_report() against core.backends.MockClient at several
+concurrency levels and prints p50/p95/p99 of the whole report and of every
+pipeline stage, plus reports/sec. With `--latency fixed:0:0` the model is
+free, so what is left is our own overhead (prompt building, sanitize_text,
+PDF rendering). `--app N` also times N Streamlit reruns of app.py through
+AppTest (first paint, the "리포트 생성하기" run, which only submits the
+background job, and the time until the English report is shown).
+
+Run from the repository root:
+    python benchmarks/bench_e2e.py [-n 40] [--concurrency 1,4,16] [--latency lognormal:0.5:0.005:0.3]
+"""
+import argparse
+import math
+import os
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from core.backends import LatencyModel, MockClient, load_recordings
+from core.engine import GenerationEngine
+from core.pipeline import GENERATION_MODES, LANGUAGES, calls_per_report, generate_report
+from core.stages import StageTracker
+
+NOTES = [
+    "45세 남성, 고혈압(2기) 및 고지혈증 진단. 아토르바스타틴 20mg 처방 예정.",
+    "52세 여성, 제2형 당뇨병 (HbA1C 8.2%), BMI 32. 메트포르민 복용 중, 생활습관 개선 권장.",
+    "30세 환자, 호흡곤란 및 쌕쌕거림으로 내원. 흡입용 스테로이드 처방.",
+    "60세 여성, CKD 3단계 (eGFR 42). 아몰로디핀 복용 중. 저염식 및 신장내과 추적 관찰 필요.",
+]
+
+
+def percentile(samples, q):
+    # 최근접 순위 방식 (표본이 적어도 실제 관측값을 보고)
+    ordered = sorted(samples)
+    return ordered[max(0, math.ceil(q / 100 * len(ordered)) - 1)]
+
+
+def print_row(name, samples):
+    ms = [s * 1000 for s in samples]
+    print(f"  {name:<28}{percentile(ms, 50):>10.1f}{percentile(ms, 95):>10.1f}{percentile(ms, 99):>10.1f}"
+          f"{statistics.mean(ms):>10.1f}")
+
+
+def run_level(engine, concurrency, n, languages, mode, stream):
+    def one(i):
+        # 메모마다 고유 번호를 붙여 모의 응답의 지연 시간 난수도 메모마다 다르게
+        note = f"{NOTES[i % len(NOTES)]} (#{i})"
+        tracker = StageTracker()
+        on_delta = (lambda lang, section, chunk: None) if stream else None
+        start = time.perf_counter()
+        generate_report(note, languages, engine=engine, tracker=tracker, mode=mode, on_delta=on_delta)
+        return time.perf_counter() - start, tracker.summary()
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(one, range(n)))
+    wall = time.perf_counter() - start
+
+    stages = {}
+    overhead = []
+    for _, summary in results:
+        for stage, seconds in summary:
+            stages.setdefault(stage, []).append(seconds)
+        overhead.append(sum(seconds for stage, seconds in summary if not stage.startswith("llm:")))
+
+    print(f"\nconcurrency={concurrency}  reports={n}  {n / wall:.2f} reports/s")
+    print(f"  {'stage':<28}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'mean ms':>10}")
+    print_row("end-to-end", [elapsed for elapsed, _ in results])
+    print_row("non-LLM stages (overhead)", overhead)
+    for stage, samples in stages.items():
+        print_row(stage, samples)
+
+
+def run_app(runs, latency):
+    from streamlit.testing.v1 import AppTest
+
+    os.chdir(ROOT)
+    os.environ["LLM_BACKEND"] = "mock"
+    os.environ["MOCK_LATENCY"] = latency
+    # 매번 새 리포트가 생성되도록 빈 캐시 사용
+    os.environ["REPORT_CACHE_PATH"] = os.path.join(tempfile.mkdtemp(), "reports.sqlite3")
+    first_paint, report_runs, ready = [], [], []
+    for _ in range(runs):
+        start = time.perf_counter()
+        at = AppTest.from_file("app.py", default_timeout=120)
+        at.run()
+        first_paint.append(time.perf_counter() - start)
+        at.sidebar.text_area[0].input(f"{NOTES[1]} ({uuid.uuid4().hex[:6]})").run()
+        start = time.perf_counter()
+        [button for button in at.button if "리포트" in button.label][0].click().run()
+        report_runs.append(time.perf_counter() - start)
+        # AppTest 는 run_every fragment 를 돌리지 않으므로 직접 재실행하며 작업 완료를 폴링
+        while at.session_state["report"]["primary"] is None and not at.session_state["report"]["errors"]:
+            time.sleep(0.05)
+            at.run()
+        ready.append(time.perf_counter() - start)
+        if at.exception or at.session_state["report"]["errors"]:
+            raise RuntimeError(at.exception or at.session_state["report"]["errors"])
+
+    print(f"\nStreamlit app.py via AppTest  runs={runs}")
+    print(f"  {'rerun':<28}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'mean ms':>10}")
+    print_row("first paint", first_paint)
+    print_row("report button", report_runs)
+    print_row("English report shown", ready)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-n", type=int, default=40, help="reports per concurrency level")
+    parser.add_argument("--concurrency", default="1,4,16", help="comma-separated concurrent reports")
+    parser.add_argument("--latency", default="lognormal:0.5:0.005:0.3",
+                        help="mock latency distribution:first_token_s:per_token_s[:jitter]")
+    parser.add_argument("--mode", default="four_call", choices=GENERATION_MODES)
+    parser.add_argument("--languages", default=",".join(LANGUAGES))
+    parser.add_argument("--stream", action="store_true", help="stream the completions like app.py")
+    parser.add_argument("--recordings", help="JSONL of recorded responses to replay (core.backends.RecordingClient)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--app", type=int, default=0, metavar="N", help="also time N Streamlit runs of app.py")
+    args = parser.parse_args()
+
+    client = MockClient(
+        recordings=load_recordings(args.recordings) if args.recordings else None,
+        latency=LatencyModel.from_spec(args.latency),
+        seed=args.seed,
+    )
+    languages = args.languages.split(",")
+    print(f"mode={args.mode} languages={languages} latency={args.latency} stream={args.stream}")
+    for concurrency in (int(level) for level in args.concurrency.split(",")):
+        engine = GenerationEngine(client=client, max_workers=concurrency * calls_per_report(languages),
+                                  call_timeout=None)
+        try:
+            run_level(engine, concurrency, args.n, languages, args.mode, args.stream)
+        finally:
+            engine.shutdown()
+    if args.app:
+        run_app(args.app, args.latency)
+
+
+if __name__ == "__main__":
+    main()
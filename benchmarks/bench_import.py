@@ -0,0 +1,87 @@
+"""Cold-start import time of app.py: eager top-level imports vs. lazy loading.
+
+Each variant is imported in a fresh interpreter, so nothing is cached in
+sys.modules between runs.
+
+Run from the repository root:  python benchmarks/bench_import.py [-n 5] [--profile]
+"""
+import argparse
+import ast
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 최적화 전 (baseline) app.py 가 맨 위에서 import 하던 모듈 그대로
+EAGER = [
+    "streamlit", "openai", "os", "fpdf", "fpdf.enums", "matplotlib.pyplot",
+    "io", "dotenv", "time", "base64",
+]
+
+
+def top_level_imports(path):
+    """Modules imported at module level of `path` (imports inside functions are lazy)."""
+    with open(path, encoding="utf-8") as f:
+        tree = ast.parse(f.read(), filename=path)
+    modules = []
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            names = [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            names = [node.module]
+        else:
+            continue
+        modules.extend(name for name in names if name not in modules)
+    return modules
+
+
+# 지금 app.py 가 첫 화면을 그리기 전에 import 하는 모듈 (나머지는 버튼을 누른 뒤에)
+LAZY = top_level_imports(os.path.join(ROOT, "app.py"))
+
+
+def import_seconds(modules):
+    code = f"import time; start = time.perf_counter(); import {', '.join(modules)}; print(time.perf_counter() - start)"
+    result = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+    return float(result.stdout)
+
+
+def profile(modules, top=15):
+    # python -X importtime 출력에서 누적 시간이 큰 최상위 모듈만 추림
+    code = f"import {', '.join(modules)}"
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=ROOT, capture_output=True, text=True)
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if cumulative.strip().isdigit() and not name.startswith("  "):
+            rows.append((int(cumulative) / 1000, name.strip()))
+    for ms, name in sorted(rows, reverse=True)[:top]:
+        print(f"  {ms:8.1f} ms  {name}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-n", type=int, default=5, help="fresh interpreters per variant")
+    parser.add_argument("--profile", action="store_true", help="also print the heaviest imports of each variant")
+    args = parser.parse_args()
+
+    eager = [import_seconds(EAGER) * 1000 for _ in range(args.n)]
+    lazy = [import_seconds(LAZY) * 1000 for _ in range(args.n)]
+
+    print(f"n={args.n}")
+    print(f"{'variant':<24}{'median ms':>12}{'mean ms':>12}")
+    print(f"{'eager (baseline app)':<24}{statistics.median(eager):>12.1f}{statistics.mean(eager):>12.1f}")
+    print(f"{'lazy (first paint)':<24}{statistics.median(lazy):>12.1f}{statistics.mean(lazy):>12.1f}")
+    print(f"speedup (median): {statistics.median(eager) / statistics.median(lazy):.2f}x")
+
+    if args.profile:
+        for label, modules in (("eager", EAGER), ("lazy", LAZY)):
+            print(f"\nheaviest top-level imports ({label}):")
+            profile(modules)
+
+
+if __name__ == "__main__":
+    main()
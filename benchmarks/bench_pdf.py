@@ -0,0 +1,118 @@
+"""Per-PDF render time: fresh FPDF + add_font per report vs. ReportRenderer.
+
+Also renders reports of varying length and glyph sets on one shared renderer
+from several threads at once (like the app's JobQueue, service.py and
+batch.py --concurrency) and counts failed renders.
+
+Run from the repository root:  python benchmarks/bench_pdf.py [-n 30] [--threads 2,4,8]
+"""
+import argparse
+import os
+import statistics
+import string
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fpdf import FPDF
+from fpdf.enums import XPos, YPos
+
+from core.languages import available_languages
+from core.pdf import REPORT_LAYOUTS, ReportRenderer
+
+SECTIONS = [
+    "- Type 2 diabetes means your body has trouble using insulin to control blood sugar. " * 12,
+    "- According to the CDC, regular walking for 30 minutes a day lowers blood sugar. " * 12,
+]
+
+
+def render_legacy(layout, sections):
+    # 이전 app.py 방식: 리포트마다 FPDF 생성 + TTF 파싱 (영문은 BI 스타일까지 등록)
+    fonts = dict(layout["fonts"])
+    if layout["family"] == "DejaVu":
+        fonts["BI"] = "fonts/DejaVuSans-BoldOblique.ttf"
+    pdf = FPDF()
+    pdf.add_page()
+    for style, path in fonts.items():
+        pdf.add_font(layout["family"], style, path)
+    pdf.set_font(layout["family"], size=layout["title_size"])
+    pdf.set_text_color(0, 51, 102)
+    pdf.cell(0, 12, "Patient Report", new_x=XPos.LMARGIN, new_y=YPos.NEXT, align="C")
+    pdf.ln(8)
+    for heading, text in zip(layout["headings"], sections):
+        pdf.set_font(layout["family"], size=14, style="B")
+        pdf.cell(0, 10, heading, new_x=XPos.LMARGIN, new_y=YPos.NEXT, align="C")
+        pdf.set_font(layout["family"], size=12)
+        pdf.multi_cell(0, 8, text)
+        pdf.ln(4)
+    pdf.set_font(layout["family"], size=10, style="I")
+    pdf.set_text_color(100, 100, 100)
+    pdf.multi_cell(0, 6, layout["disclaimer"])
+    pdf.ln(3)
+    pdf.set_text_color(120, 120, 120)
+    pdf.multi_cell(pdf.w - 2 * pdf.l_margin, 6, layout["credit"], align="R")
+    return bytes(pdf.output())
+
+
+def measure(fn, n):
+    samples = []
+    for _ in range(n):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples), statistics.mean(samples)
+
+
+def varied_sections(i):
+    # 리포트마다 길이와 사용 글자가 달라야 폰트 서브셋 공유 문제가 드러남
+    chars = string.ascii_letters[i % 40:] + "0123456789:;()%•–—…"
+    return [f"- Point {chars} about your condition. " * (5 + i % 17), f"- The CDC {chars[::-1]} says. " * (3 + i % 11)]
+
+
+def check_concurrency(renderer, threads, n):
+    def one(i):
+        try:
+            return renderer.render(varied_sections(i)).startswith(b"%PDF")
+        except Exception:
+            return False
+
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        return n - sum(pool.map(one, range(n)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-n", type=int, default=30, help="renders per variant")
+    # 폰트가 fonts/ 에 없는 언어는 측정할 수 없으므로 선택지에서 제외
+    parser.add_argument("--layout", default="eng", choices=available_languages())
+    parser.add_argument("--threads", default="2,4,8", help="comma-separated thread counts for the concurrency check")
+    args = parser.parse_args()
+
+    layout = REPORT_LAYOUTS[args.layout]
+    start = time.perf_counter()
+    renderer = ReportRenderer.from_layout(args.layout)
+    setup_ms = (time.perf_counter() - start) * 1000
+
+    legacy = measure(lambda: render_legacy(layout, SECTIONS), args.n)
+    cached = measure(lambda: renderer.render(SECTIONS), args.n)
+
+    print(f"layout={args.layout} n={args.n}")
+    print(f"renderer setup (once per process): {setup_ms:8.1f} ms")
+    print(f"{'variant':<24}{'median ms':>12}{'mean ms':>12}")
+    print(f"{'fresh FPDF + add_font':<24}{legacy[0]:>12.1f}{legacy[1]:>12.1f}")
+    print(f"{'ReportRenderer':<24}{cached[0]:>12.1f}{cached[1]:>12.1f}")
+    print(f"speedup (median): {legacy[0] / cached[0]:.2f}x")
+
+    failures = 0
+    for threads in (int(level) for level in args.threads.split(",")):
+        failed = check_concurrency(renderer, threads, 32)
+        failures += failed
+        print(f"shared renderer, {threads} threads: {failed}/32 renders failed")
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""sanitize_text throughput: per-character generator (archive/app_*.py) vs. the
+precompiled regex in core.text, which replaces runs of unsafe characters with
+one callback per run.
+
+Run from the repository root:  python benchmarks/bench_sanitize.py [-n 200]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.text import sanitize_text
+
+
+def sanitize_legacy(text):
+    return ''.join(
+        c if ('\u0000' <= c <= '\u007F') or ('가' <= c <= '힯') or c in ".,!?()-/:%" else ' '
+        for c in text
+    )
+
+
+# 모델 출력과 비슷한 4-8KB 텍스트 (영어 / 한국어 / 둥근 따옴표·글머리 기호 섞인 영어)
+SAMPLES = {
+    "english": "- eGFR (estimated Glomerular Filtration Rate) shows how well your kidneys filter blood. "
+               "Amlodipine: helps lower blood pressure to reduce strain on the heart.\n" * 40,
+    "korean": "- 사구체여과율(eGFR)은 신장이 혈액을 얼마나 잘 거르는지 보여줍니다. "
+              "아몰로디핀은 혈압을 낮춰 심장의 부담을 줄여 줍니다.\n" * 40,
+    "mixed": "• According to the CDC, “regular walking” for 30 minutes a day lowers HbA1c ≥ 0.5% — "
+             "start slowly… 미국질병통제예방센터(CDC) 권고.\n" * 40,
+}
+
+
+def throughput(fn, text, n):
+    start = time.perf_counter()
+    for _ in range(n):
+        fn(text)
+    seconds = time.perf_counter() - start
+    return len(text.encode("utf-8")) * n / seconds / 1e6, seconds / n * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-n", type=int, default=200, help="calls per sample and variant")
+    args = parser.parse_args()
+
+    print(f"{'sample':<10}{'KB':>6}{'legacy MB/s':>14}{'new MB/s':>12}{'legacy us':>12}{'new us':>10}{'speedup':>10}")
+    for name, text in SAMPLES.items():
+        legacy_mbps, legacy_us = throughput(sanitize_legacy, text, args.n)
+        new_mbps, new_us = throughput(sanitize_text, text, args.n)
+        print(f"{name:<10}{len(text.encode('utf-8')) / 1024:>6.1f}{legacy_mbps:>14.1f}{new_mbps:>12.1f}"
+              f"{legacy_us:>12.1f}{new_us:>10.1f}{legacy_us / new_us:>9.1f}x")
+
+    # 새 구현은 둥근 따옴표, 글머리 기호, ≥, 말줄임표를 지우지 않음
+    print(f"\nlegacy: {sanitize_legacy(SAMPLES['mixed'].splitlines()[0])!r}")
+    print(f"new:    {sanitize_text(SAMPLES['mixed'].splitlines()[0])!r}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,18 @@
+import importlib
+
+# 무거운 의존성(openai, fpdf 등)은 실제로 쓸 때 import (core.cache 같은 가벼운 모듈만 쓸 때 느려지지 않도록)
+_EXPORTS = {
+    "GenerationEngine": "core.engine",
+    "GenerationError": "core.engine",
+    "LANGUAGES": "core.pipeline",
+    "Report": "core.pipeline",
+    "generate_report": "core.pipeline",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module 'core' has no attribute {name!r}")
+    return getattr(importlib.import_module(_EXPORTS[name]), name)
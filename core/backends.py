@@ -0,0 +1,197 @@
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from types import SimpleNamespace
+
+from core.text import estimate_tokens
+
+# LLM_BACKEND=mock 이면 OpenAI 대신 MockClient 사용 (API 키 없이 앱/배치/벤치마크 실행)
+BACKENDS = ("openai", "mock")
+LATENCY_DISTRIBUTIONS = ("fixed", "uniform", "lognormal")
+
+
+def message_key(messages):
+    """Stable key of a chat message list, used to look up recorded responses."""
+    payload = json.dumps([[m["role"], m["content"]] for m in messages], ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LatencyModel:
+    """Time to first token plus a per-token streaming delay.
+
+    distribution -- "fixed" (always the medians), "uniform" (±jitter around
+                    them) or "lognormal" (median with shape `jitter`, the
+                    long right tail real APIs have)
+    """
+
+    def __init__(self, first_token=0.5, per_token=0.01, distribution="lognormal", jitter=0.3):
+        if distribution not in LATENCY_DISTRIBUTIONS:
+            raise ValueError(f"Unknown latency distribution: {distribution}")
+        self.first_token = first_token
+        self.per_token = per_token
+        self.distribution = distribution
+        self.jitter = jitter
+
+    @classmethod
+    def from_spec(cls, spec):
+        """Parse "distribution:first_token:per_token[:jitter]", e.g. "lognormal:0.8:0.02:0.4"."""
+        distribution, *values = spec.split(":")
+        return cls(*(float(value) for value in values[:2]), distribution=distribution,
+                   **({"jitter": float(values[2])} if len(values) > 2 else {}))
+
+    def sample(self, rng):
+        """(seconds to first token, seconds per token) for one call."""
+        if self.distribution == "fixed":
+            scale = 1.0
+        elif self.distribution == "uniform":
+            scale = rng.uniform(1 - self.jitter, 1 + self.jitter)
+        else:
+            scale = rng.lognormvariate(0, self.jitter)
+        return self.first_token * scale, self.per_token * scale
+
+
+class MockClient:
+    """Offline stand-in for the OpenAI client used by GenerationEngine.
+
+    Implements the one method the engine calls,
+    `chat.completions.create(model, messages, stream, ...)`, and returns
+    response/chunk objects shaped like the SDK's (including `usage`), so the
+    whole pipeline runs unchanged without a key or network.
+
+    Responses are replayed from `recordings` ({message_key: text}, see
+    load_recordings / RecordingClient); prompts that were never recorded get
+    a deterministic synthetic bullet list. Latency comes from `latency`, and
+    every call's random draw is seeded from `seed` and the prompt, so runs
+    are reproducible regardless of thread scheduling.
+    """
+
+    def __init__(self, recordings=None, latency=None, seed=0, completion_tokens=400):
+        self.recordings = recordings or {}
+        self.latency = latency or LatencyModel()
+        self.seed = seed
+        self.completion_tokens = completion_tokens
+        self.calls = 0
+        self._lock = threading.Lock()
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    @classmethod
+    def from_env(cls):
+        """Mock client configured by MOCK_RECORDINGS (JSONL path),
+        MOCK_LATENCY ("lognormal:0.5:0.01:0.3") and MOCK_SEED."""
+        path = os.getenv("MOCK_RECORDINGS")
+        spec = os.getenv("MOCK_LATENCY")
+        return cls(
+            recordings=load_recordings(path) if path else None,
+            latency=LatencyModel.from_spec(spec) if spec else None,
+            seed=int(os.getenv("MOCK_SEED", 0)),
+        )
+
+    def create(self, model, messages, stream=False, response_format=None, stream_options=None, timeout=None,
+               **kwargs):
+        key = message_key(messages)
+        with self._lock:
+            self.calls += 1
+        text = self.recordings.get(key)
+        if text is None:
+            text = synthesize(messages, response_format, self.completion_tokens)
+        usage = SimpleNamespace(
+            prompt_tokens=sum(estimate_tokens(m["content"]) for m in messages),
+            completion_tokens=estimate_tokens(text),
+            prompt_tokens_details=SimpleNamespace(cached_tokens=0),
+        )
+        usage.total_tokens = usage.prompt_tokens + usage.completion_tokens
+
+        rng = random.Random(f"{self.seed}/{key}")
+        first_token, per_token = self.latency.sample(rng)
+        if not stream:
+            time.sleep(first_token + per_token * usage.completion_tokens)
+            message = SimpleNamespace(role="assistant", content=text)
+            return SimpleNamespace(model=model, choices=[SimpleNamespace(message=message, finish_reason="stop")],
+                                   usage=usage)
+        include_usage = bool(stream_options and stream_options.get("include_usage"))
+        return _stream(text, first_token, per_token, usage if include_usage else None)
+
+
+def _stream(text, first_token, per_token, usage):
+    time.sleep(first_token)
+    # 청크 하나에 대략 토큰 4개 (실제 API 의 SSE 청크와 비슷한 크기)
+    step = 16
+    for start in range(0, len(text), step):
+        piece = text[start:start + step]
+        delta = SimpleNamespace(role=None, content=piece)
+        yield SimpleNamespace(choices=[SimpleNamespace(delta=delta, finish_reason=None)], usage=None)
+        time.sleep(per_token * estimate_tokens(piece))
+    if usage is not None:
+        yield SimpleNamespace(choices=[], usage=usage)
+
+
+def synthesize(messages, response_format=None, completion_tokens=400):
+    """Deterministic placeholder response of roughly `completion_tokens`."""
+    prompt = "\n".join(message["content"] for message in messages)
+    korean = "to Korean" in prompt or "in Korean" in prompt
+    line = ("- 이 항목은 오프라인 모의 응답입니다. 실제 모델 대신 재현 가능한 문장을 돌려줍니다."
+            if korean else "- This is an offline mock response that stands in for the model output.")
+    count = max(1, completion_tokens // estimate_tokens(line))
+    digest = message_key(messages)[:8]
+    text = "\n".join(f"{line} ({digest}-{i + 1})" for i in range(count))
+    if not (response_format and response_format.get("type") == "json_object"):
+        return text
+
+    # JSON 모드: 프롬프트에 실린 스키마의 최상위 속성(언어)마다 모든 필드를 채움
+    schema = next((json.loads(row) for row in prompt.splitlines() if row.startswith("{")), {})
+    definitions = schema.get("$defs", {})
+    body = {}
+    for name, prop in schema.get("properties", {}).items():
+        ref = definitions.get(prop.get("$ref", "").rsplit("/", 1)[-1], {})
+        body[name] = {field: text for field in ref.get("properties", {})} or text
+    return json.dumps(body, ensure_ascii=False)
+
+
+def load_recordings(path):
+    """{message_key: response text} from a JSONL file written by RecordingClient."""
+    recordings = {}
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                row = json.loads(line)
+                recordings[row["key"]] = row["response"]
+    return recordings
+
+
+class RecordingClient:
+    """Wraps a real client and appends every response to a JSONL file, so a
+    live session can later be replayed with MockClient(load_recordings(path))."""
+
+    def __init__(self, client, path):
+        self.client = client
+        self.path = path
+        self._lock = threading.Lock()
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(self, messages, stream=False, **kwargs):
+        response = self.client.chat.completions.create(messages=messages, stream=stream, **kwargs)
+        if not stream:
+            self._save(messages, response.choices[0].message.content)
+            return response
+        return self._record_stream(messages, response)
+
+    def _record_stream(self, messages, response):
+        parts = []
+        try:
+            for chunk in response:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    parts.append(chunk.choices[0].delta.content)
+                yield chunk
+        finally:
+            if hasattr(response, "close"):
+                response.close()
+        self._save(messages, "".join(parts))
+
+    def _save(self, messages, text):
+        row = {"key": message_key(messages), "prompt": messages[-1]["content"][:200], "response": text}
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(row, ensure_ascii=False) + "\n")
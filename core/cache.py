@@ -0,0 +1,146 @@
+import hashlib
+import json
+import os
+import pickle
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+
+DEFAULT_PATH = os.path.join(".cache", "reports.sqlite3")
+# 메모리 적중의 accessed 갱신은 모아서 이만큼 쌓이면 (또는 다음 set() 의 정리 전에) 한 번에 기록
+TOUCH_BATCH = 32
+
+
+def normalize_note(note):
+    # 공백/대소문자/유니코드 정규화만 다른 메모는 같은 리포트로 취급
+    note = unicodedata.normalize("NFC", note).casefold()
+    return " ".join(note.split())
+
+
+class ReportCache:
+    """Content-addressed report cache: in-memory LRU in front of SQLite.
+
+    Entries expire after `ttl` seconds; the disk store keeps at most
+    `max_entries` rows (least recently used are evicted first). Memory hits
+    count as use too: their access times are written to disk in batches.
+    """
+
+    def __init__(self, path=DEFAULT_PATH, ttl=7 * 24 * 3600, max_entries=1000, memory_entries=128):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.memory_entries = memory_entries
+        self.hits = 0
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._memory = OrderedDict()
+        self._touched = {}  # {key: 아직 디스크에 기록하지 않은 메모리 적중 시각}
+        self._lock = threading.Lock()
+
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS reports ("
+            "key TEXT PRIMARY KEY, value BLOB NOT NULL, created REAL NOT NULL, accessed REAL NOT NULL)"
+        )
+        self._db.commit()
+
+    @classmethod
+    def from_env(cls):
+        return cls(
+            path=os.getenv("REPORT_CACHE_PATH", DEFAULT_PATH),
+            ttl=float(os.getenv("REPORT_CACHE_TTL", 7 * 24 * 3600)),
+            max_entries=int(os.getenv("REPORT_CACHE_MAX_ENTRIES", 1000)),
+            memory_entries=int(os.getenv("REPORT_CACHE_MEMORY_ENTRIES", 128)),
+        )
+
+    @staticmethod
+    def make_key(note, prompt_version, model, language=None):
+        payload = json.dumps([normalize_note(note), prompt_version, model, language], ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key):
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                created, value = entry
+                if now - created <= self.ttl:
+                    self._memory.move_to_end(key)
+                    # 메모리에서만 읽히는 인기 항목이 디스크 LRU 정리에서 가장 먼저 지워지지 않도록
+                    self._touched[key] = now
+                    if len(self._touched) >= TOUCH_BATCH:
+                        self._flush_touched()
+                        self._db.commit()
+                    self.hits += 1
+                    self.memory_hits += 1
+                    return value
+                del self._memory[key]
+
+            row = self._db.execute("SELECT value, created FROM reports WHERE key = ?", (key,)).fetchone()
+            if row is None or now - row[1] > self.ttl:
+                if row is not None:
+                    self._db.execute("DELETE FROM reports WHERE key = ?", (key,))
+                    self._db.commit()
+                self.misses += 1
+                return None
+
+            self._touched.pop(key, None)
+            self._db.execute("UPDATE reports SET accessed = ? WHERE key = ?", (now, key))
+            self._db.commit()
+            value = pickle.loads(row[0])
+            self._remember(key, row[1], value)
+            self.hits += 1
+            self.disk_hits += 1
+            return value
+
+    def set(self, key, value):
+        now = time.time()
+        with self._lock:
+            self._remember(key, now, value)
+            self._db.execute(
+                "INSERT OR REPLACE INTO reports (key, value, created, accessed) VALUES (?, ?, ?, ?)",
+                (key, pickle.dumps(value), now, now),
+            )
+            # --- Evict expired rows, then the least recently used beyond the size cap ---
+            self._flush_touched()
+            self._db.execute("DELETE FROM reports WHERE created < ?", (now - self.ttl,))
+            self._db.execute(
+                "DELETE FROM reports WHERE key NOT IN (SELECT key FROM reports ORDER BY accessed DESC LIMIT ?)",
+                (self.max_entries,),
+            )
+            self._db.commit()
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            self._touched.clear()
+            self._db.execute("DELETE FROM reports")
+            self._db.commit()
+
+    def stats(self):
+        with self._lock:
+            size = self._db.execute("SELECT COUNT(*) FROM reports").fetchone()[0]
+            return {
+                "hits": self.hits,
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "entries": size,
+            }
+
+    def _flush_touched(self):
+        if self._touched:
+            self._db.executemany("UPDATE reports SET accessed = ? WHERE key = ?",
+                                 [(accessed, key) for key, accessed in self._touched.items()])
+            self._touched.clear()
+
+    def _remember(self, key, created, value):
+        self._memory[key] = (created, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
@@ -0,0 +1,70 @@
+import warnings
+from functools import lru_cache
+from io import BytesIO
+
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from matplotlib.font_manager import FontProperties
+
+from core.languages import LANGUAGE_PROFILES, font_covers
+
+# 언어별 차트 문구와 폰트는 core.languages 레지스트리에서 (DejaVu 에 없는 글자는 언어별 폰트 사용)
+CHART_LAYOUTS = {lang: profile["chart"] for lang, profile in LANGUAGE_PROFILES.items()}
+
+
+def risk_color(score):
+    if score >= 3:
+        return "red"
+    if score == 2:
+        return "orange"
+    return "green"
+
+
+def risk_chart_png(scores, lang="eng"):
+    """PNG bytes of the risk bar chart for {condition: score}.
+
+    Charts are cached by (language, score vector), so reports with the same
+    risk profile reuse the rendered bytes.
+    """
+    return _render_risk_chart(lang, tuple(scores.items()))
+
+
+@lru_cache(maxsize=None)
+def _chart_layout(lang):
+    # 언어 폰트가 없거나 글리프가 모자라면 matplotlib 기본 폰트(DejaVu)로 그려서 네모 글자가 나오므로 영어 문구로 대신함
+    layout = CHART_LAYOUTS[lang]
+    if not layout["font"]:
+        return layout, None
+    text = layout["title"] + layout["ylabel"] + "".join(layout["conditions"].values())
+    if not font_covers(layout["font"], text):
+        warnings.warn(
+            f"{layout['font']} is missing or lacks glyphs for the {lang} risk chart; drawing English labels instead",
+            RuntimeWarning,
+        )
+        return CHART_LAYOUTS["eng"], None
+    return layout, FontProperties(fname=layout["font"])
+
+
+@lru_cache(maxsize=256)
+def _render_risk_chart(lang, items):
+    layout, font = _chart_layout(lang)
+    labels = [layout["conditions"].get(condition, condition) for condition, _ in items]
+    scores = [score for _, score in items]
+
+    # pyplot 전역 상태(figure 관리자)를 거치지 않는 객체지향 Agg 렌더링
+    fig = Figure(figsize=(6.4, 4.8))
+    FigureCanvasAgg(fig)
+    ax = fig.subplots()
+    ax.bar(labels, scores, color=[risk_color(score) for score in scores])
+    ax.set_ylabel(layout["ylabel"], fontproperties=font)
+    ax.set_title(layout["title"], fontproperties=font)
+    for label in ax.get_xticklabels():
+        label.set_rotation(45)
+        label.set_horizontalalignment("right")
+        if font is not None:
+            label.set_fontproperties(font)
+
+    buffer = BytesIO()
+    fig.savefig(buffer, format="png", bbox_inches="tight")
+    fig.clear()
+    return buffer.getvalue()
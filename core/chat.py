@@ -0,0 +1,76 @@
+import os
+
+from core.cache import ReportCache
+from core.prompts import build_chat_system_prompt, prompt_version
+from core.text import estimate_tokens, sanitize_text
+
+HISTORY_TOKEN_BUDGET = int(os.getenv("CHAT_HISTORY_TOKENS", 1500))
+
+
+def trim_history(history, budget=HISTORY_TOKEN_BUDGET):
+    """Most recent messages of `history` that fit in `budget` tokens.
+
+    The result always starts with a user message so the model never sees an
+    answer without its question.
+    """
+    kept, used = [], 0
+    for message in reversed(history):
+        used += estimate_tokens(message["content"])
+        if used > budget:
+            break
+        kept.append(message)
+    kept.reverse()
+    while kept and kept[0]["role"] != "user":
+        kept.pop(0)
+    return kept
+
+
+class ChatSession:
+    """Follow-up Q&A about one report in one language.
+
+    The note and the generated explanation go into the system message once;
+    only the trimmed history and the new question are added per turn.
+    First questions (no history) are answered from `cache` when the same
+    question was already asked about the same note.
+    """
+
+    def __init__(self, note, explanation, lang, history_budget=HISTORY_TOKEN_BUDGET):
+        self.note = note
+        self.lang = lang
+        self.history_budget = history_budget
+        self.system_prompt = build_chat_system_prompt(note, explanation, lang)
+        self.history = []  # [{"role": "user" | "assistant", "content": str}]
+
+    def messages(self, question):
+        return (
+            [{"role": "system", "content": self.system_prompt}]
+            + trim_history(self.history, self.history_budget)
+            + [{"role": "user", "content": question}]
+        )
+
+    def ask(self, engine, question, cache=None, on_delta=None, on_usage=None):
+        """Answer `question`, streaming sanitized chunks to on_delta(chunk).
+
+        `on_usage` receives the token counts of the completion (not called
+        for cached answers).
+        """
+        key = None
+        if cache is not None and not self.history:
+            version = prompt_version(["chat"])
+            key = ReportCache.make_key(f"{self.note}\n\n{question}", f"{version}/chat", engine.model, self.lang)
+            answer = cache.get(key)
+            if answer is not None:
+                if on_delta is not None:
+                    on_delta(answer)
+                self._remember(question, answer)
+                return answer
+
+        stream = (lambda chunk: on_delta(sanitize_text(chunk, self.lang))) if on_delta is not None else None
+        answer = sanitize_text(engine.complete(self.messages(question), on_delta=stream, on_usage=on_usage), self.lang)
+        if key is not None:
+            cache.set(key, answer)
+        self._remember(question, answer)
+        return answer
+
+    def _remember(self, question, answer):
+        self.history += [{"role": "user", "content": question}, {"role": "assistant", "content": answer}]
@@ -0,0 +1,109 @@
+import os
+import re
+
+from core.text import estimate_tokens
+
+# 한 번의 호출에 넣을 메모 분량 (프롬프트 지시문과 응답을 합쳐도 gpt-3.5-turbo 컨텍스트에 여유 있게)
+CHUNK_TOKEN_BUDGET = int(os.getenv("NOTE_CHUNK_TOKENS", 1500))
+
+# 진료 기록/퇴원 요약의 섹션 제목 (줄 맨 앞에 오는 경우만)
+SECTION_HEADINGS = [
+    "chief complaint", "cc", "history of present illness", "hpi", "past medical history", "pmh",
+    "past surgical history", "family history", "social history", "review of systems", "ros",
+    "physical exam", "physical examination", "pe", "vital signs", "vitals", "labs", "laboratory",
+    "imaging", "assessment", "impression", "diagnosis", "diagnoses", "plan", "assessment and plan", "a/p",
+    "medications", "discharge medications", "allergies", "hospital course", "procedures",
+    "discharge diagnosis", "discharge instructions", "follow-up", "follow up",
+    "주소", "주호소", "현병력", "과거력", "가족력", "사회력", "진찰 소견", "신체 검사", "활력 징후",
+    "검사 결과", "검사", "영상 검사", "평가", "인상", "진단", "계획", "치료 계획", "투약", "처방",
+    "복용 약물", "알레르기", "입원 경과", "경과", "시술", "퇴원 진단", "퇴원 약물", "퇴원 안내", "추적 관찰",
+]
+_HEADING_RE = re.compile(
+    r"^[ \t]*(?:#+[ \t]*|\d+[.)][ \t]*)?[\[【(]?(?:"
+    + "|".join(re.escape(heading) for heading in sorted(SECTION_HEADINGS, key=len, reverse=True))
+    + r")[\]】)]?[ \t]*(?:[:：\-]|$)",
+    re.IGNORECASE | re.MULTILINE,
+)
+# 문장 경계: 마침표/물음표/느낌표 뒤의 공백 (한국어 '...다.' 포함)
+_SENTENCE_RE = re.compile(r"(?<=[.!?])\s+")
+_BULLET_RE = re.compile(r"^\s*(?:[-*•·]|\d+[.)])\s*")
+
+
+def split_sections(note):
+    """Split a note at clinical section headings (the text before the first
+    heading is its own section)."""
+    starts = [match.start() for match in _HEADING_RE.finditer(note)]
+    bounds = [0] + [start for start in starts if start > 0] + [len(note)]
+    return [note[start:end].strip() for start, end in zip(bounds, bounds[1:]) if note[start:end].strip()]
+
+
+def split_note(note, budget=CHUNK_TOKEN_BUDGET):
+    """Split `note` into chunks of at most ~`budget` tokens.
+
+    Whole clinical sections are packed together; a section that is too long
+    on its own is split at paragraphs, then at sentences. A note within the
+    budget comes back as a single chunk.
+    """
+    if estimate_tokens(note) <= budget:
+        return [note]
+
+    pieces = []
+    for section in split_sections(note):
+        pieces += _fit(section, budget)
+    return _pack(pieces, budget, "\n\n")
+
+
+def split_lines(text, budget=CHUNK_TOKEN_BUDGET):
+    """Split generated bullet-point text into parts of at most ~`budget` tokens.
+
+    Parts break between lines, so every bullet stays whole unless a single
+    line is longer than the budget. Text within the budget comes back as a
+    single part; "\n".join(parts) restores it without its blank lines.
+    """
+    if estimate_tokens(text) <= budget:
+        return [text]
+    pieces = [piece for line in text.splitlines() if line.strip() for piece in _fit(line.rstrip(), budget)]
+    return _pack(pieces, budget, "\n")
+
+
+def _pack(pieces, budget, separator):
+    chunks, current = [], []
+    for piece in pieces:
+        if current and estimate_tokens(separator.join(current + [piece])) > budget:
+            chunks.append(separator.join(current))
+            current = []
+        current.append(piece)
+    if current:
+        chunks.append(separator.join(current))
+    return chunks
+
+
+def _fit(text, budget):
+    if estimate_tokens(text) <= budget:
+        return [text]
+    for splitter in (re.compile(r"\n\s*\n"), _SENTENCE_RE):
+        parts = [part.strip() for part in splitter.split(text) if part.strip()]
+        if len(parts) > 1:
+            return [piece for part in parts for piece in _fit(part, budget)]
+    # 문장 하나가 예산보다 긴 경우: 글자 수 기준으로 자름
+    size = max(1, len(text) * budget // estimate_tokens(text))
+    return [text[start:start + size] for start in range(0, len(text), size)]
+
+
+def merge_bullets(outputs):
+    """Merge the bullet-point outputs of several chunks, dropping repeats.
+
+    Lines are compared after removing bullet markers, case and whitespace
+    differences and trailing punctuation; the first occurrence is kept.
+    """
+    seen, merged = set(), []
+    for output in outputs:
+        for line in output.splitlines():
+            if not line.strip():
+                continue
+            key = " ".join(_BULLET_RE.sub("", line).casefold().split()).rstrip(".:;")
+            if key in seen:
+                continue
+            seen.add(key)
+            merged.append(line.rstrip())
+    return "\n".join(merged)
@@ -0,0 +1,56 @@
+import os
+import threading
+
+import httpx
+import openai
+
+
+def make_client(api_key=None, max_connections=None, connect_timeout=None, read_timeout=None, keepalive_expiry=None):
+    """OpenAI client on a tuned, keep-alive httpx connection pool.
+
+    Unset arguments come from OPENAI_MAX_CONNECTIONS (20),
+    OPENAI_CONNECT_TIMEOUT (5s), OPENAI_READ_TIMEOUT (60s) and
+    OPENAI_KEEPALIVE_EXPIRY (120s). SDK retries are disabled because
+    GenerationEngine retries with backoff and rate limiting itself.
+
+    LLM_BACKEND=mock returns an offline core.backends.MockClient instead, and
+    LLM_RECORD=<path.jsonl> records every live response for later replay.
+    """
+    backend = os.getenv("LLM_BACKEND", "openai")
+    if backend == "mock":
+        from core.backends import MockClient
+        return MockClient.from_env()
+    if backend != "openai":
+        raise ValueError(f"Unknown LLM_BACKEND: {backend}")
+
+    max_connections = max_connections or int(os.getenv("OPENAI_MAX_CONNECTIONS", 20))
+    connect_timeout = connect_timeout or float(os.getenv("OPENAI_CONNECT_TIMEOUT", 5.0))
+    read_timeout = read_timeout or float(os.getenv("OPENAI_READ_TIMEOUT", 60.0))
+    keepalive_expiry = keepalive_expiry or float(os.getenv("OPENAI_KEEPALIVE_EXPIRY", 120.0))
+
+    # 유휴 연결을 모두 keep-alive 로 유지해서 세션/요청 간에 TLS 핸드셰이크를 다시 하지 않음
+    http_client = httpx.Client(
+        limits=httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections,
+            keepalive_expiry=keepalive_expiry,
+        ),
+        timeout=httpx.Timeout(read_timeout, connect=connect_timeout),
+    )
+    client = openai.OpenAI(api_key=api_key or os.getenv("OPENAI_API_KEY"), http_client=http_client, max_retries=0)
+    if os.getenv("LLM_RECORD"):
+        from core.backends import RecordingClient
+        return RecordingClient(client, os.getenv("LLM_RECORD"))
+    return client
+
+
+_default_client = None
+_default_client_lock = threading.Lock()
+
+
+def default_client():
+    global _default_client
+    with _default_client_lock:
+        if _default_client is None:
+            _default_client = make_client()
+        return _default_client
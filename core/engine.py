@@ -0,0 +1,285 @@
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+import openai
+from tenacity import Retrying, retry_if_exception, stop_after_attempt, wait_random_exponential
+
+from core.client import default_client
+from core.ratelimit import RateLimiter, retry_after
+from core.text import estimate_tokens
+
+DEFAULT_MODEL = "gpt-3.5-turbo"
+# 토큰 버킷에서 미리 차감하는 응답 토큰 수 (섹션 하나가 보통 500-800 토큰)
+ESTIMATED_COMPLETION_TOKENS = 800
+# 429, 타임아웃, 연결 끊김, 5xx 는 잠시 후 다시 시도하면 성공할 수 있음
+RETRYABLE_ERRORS = (
+    openai.RateLimitError,
+    openai.APITimeoutError,
+    openai.APIConnectionError,
+    openai.InternalServerError,
+)
+
+
+class GenerationError(Exception):
+    """Raised when a report section could not be generated.
+
+    `partial` holds the sections that did finish before the failure.
+    """
+
+    def __init__(self, message, partial=None):
+        super().__init__(message)
+        self.partial = partial or {}
+
+
+class GenerationCancelled(Exception):
+    pass
+
+
+class GenerationEngine:
+    """Runs the report completions on a bounded worker pool.
+
+    Independent prompts are fired together, and a follow-up prompt (e.g. the
+    Korean translation) is submitted as soon as the section it depends on lands,
+    so a report costs roughly its longest dependency chain instead of the sum
+    of all calls.
+
+    Every call first takes a request from `rate_limiter` and its estimated
+    tokens from `token_limiter`. Rate limits, timeouts and 5xx errors are
+    retried up to `max_retries` times with jittered exponential backoff
+    (honouring Retry-After), as long as nothing has been streamed yet.
+    """
+
+    def __init__(self, client=openai, model=DEFAULT_MODEL, max_workers=8, call_timeout=60.0, rate_limiter=None,
+                 token_limiter=None, max_retries=3, max_backoff=30.0):
+        self.client = client
+        self.model = model
+        self.call_timeout = call_timeout
+        self.rate_limiter = rate_limiter
+        self.token_limiter = token_limiter
+        self.max_retries = max_retries
+        self.max_backoff = max_backoff
+        self._backoff = wait_random_exponential(multiplier=1, max=max_backoff)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="llm")
+
+    @classmethod
+    def from_env(cls, **kwargs):
+        """Engine on the shared pooled client (core.client) with limits from
+        OPENAI_RPM / OPENAI_TPM / OPENAI_MAX_RETRIES.
+        """
+        if "client" not in kwargs:
+            kwargs["client"] = default_client()
+        # 연결/읽기 타임아웃은 클라이언트 설정(OPENAI_CONNECT_TIMEOUT / OPENAI_READ_TIMEOUT)을 따름
+        kwargs.setdefault("call_timeout", None)
+        rpm = int(os.getenv("OPENAI_RPM", 0))
+        tpm = int(os.getenv("OPENAI_TPM", 0))
+        kwargs.setdefault("rate_limiter", RateLimiter(rpm) if rpm else None)
+        kwargs.setdefault("token_limiter", RateLimiter(tpm) if tpm else None)
+        kwargs.setdefault("max_retries", int(os.getenv("OPENAI_MAX_RETRIES", 3)))
+        return cls(**kwargs)
+
+    def complete(self, prompt, timeout=None, on_delta=None, cancel=None, response_format=None, on_usage=None):
+        """Run one completion and return its text.
+
+        `prompt` is a single user message, or a full list of chat messages.
+        With `on_delta` the response is streamed and every content chunk is
+        passed to it as it arrives; setting `cancel` stops the stream early.
+        `on_usage` receives {"prompt_tokens", "cached_tokens",
+        "completion_tokens", "seconds"} once the completion is done (seconds
+        include retries; cached_tokens are the prompt tokens served from the
+        provider's prompt cache).
+        """
+        messages = prompt if isinstance(prompt, list) else [{"role": "user", "content": prompt}]
+        streamed = {"started": False}
+        usage = {}
+        started = time.perf_counter()
+
+        def forward(chunk):
+            streamed["started"] = True
+            on_delta(chunk)
+
+        # 이미 일부를 스트리밍한 뒤에는 재시도하면 내용이 중복되므로 그대로 실패 처리
+        retrying = Retrying(
+            retry=retry_if_exception(lambda e: isinstance(e, RETRYABLE_ERRORS) and not streamed["started"]),
+            wait=self._wait,
+            stop=stop_after_attempt(self.max_retries + 1),
+            reraise=True,
+        )
+        text = retrying(
+            self._complete_once, messages, timeout, forward if on_delta is not None else None, cancel,
+            response_format, usage,
+        )
+        if on_usage is not None:
+            # 응답에 usage 가 없으면(일부 호환 API) 글자 수로 추정
+            on_usage({
+                "prompt_tokens": usage.get("prompt_tokens", sum(estimate_tokens(m["content"]) for m in messages)),
+                "cached_tokens": usage.get("cached_tokens", 0),
+                "completion_tokens": usage.get("completion_tokens", estimate_tokens(text)),
+                "seconds": time.perf_counter() - started,
+            })
+        return text
+
+    def _complete_once(self, messages, timeout, on_delta, cancel, response_format, usage):
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
+        if self.token_limiter is not None:
+            prompt_tokens = sum(estimate_tokens(message["content"]) for message in messages)
+            self.token_limiter.acquire(prompt_tokens + ESTIMATED_COMPLETION_TOKENS)
+        options = {"response_format": response_format} if response_format is not None else {}
+        if timeout or self.call_timeout:
+            options["timeout"] = timeout or self.call_timeout
+        if on_delta is not None:
+            # 스트리밍 응답은 마지막 청크에만 usage 가 담겨 옴
+            options["stream_options"] = {"include_usage": True}
+        response = self.client.chat.completions.create(
+            model=self.model,
+            messages=messages,
+            stream=on_delta is not None,
+            **options,
+        )
+        if on_delta is None:
+            _read_usage(response, usage)
+            return response.choices[0].message.content.strip()
+
+        parts = []
+        try:
+            for chunk in response:
+                if cancel is not None and cancel.is_set():
+                    raise GenerationCancelled()
+                if chunk.choices and chunk.choices[0].delta.content:
+                    parts.append(chunk.choices[0].delta.content)
+                    on_delta(chunk.choices[0].delta.content)
+                _read_usage(chunk, usage)
+        finally:
+            if hasattr(response, "close"):
+                response.close()
+        return "".join(parts).strip()
+
+    def _wait(self, retry_state):
+        error = retry_state.outcome.exception()
+        delay = max(self._backoff(retry_state), retry_after(error) or 0)
+        if isinstance(error, openai.RateLimitError) and self.rate_limiter is not None:
+            # 다른 워커들도 같이 쉬도록 limiter 전체를 멈춤
+            self.rate_limiter.pause(delay)
+        return delay
+
+    def stream(self, prompts, follow_ups=None, timeout=None, deltas=True):
+        """Generate every section, yielding (kind, name, payload, at) events.
+
+        prompts    -- {name: prompt} submitted immediately
+        follow_ups -- {name: (source_name, build_prompt)}; build_prompt receives
+                      the finished source text and returns the follow-up prompt
+        timeout    -- overall deadline in seconds for the whole report
+        deltas     -- stream the completions and yield ("delta", name, chunk)
+
+        ("start", name, prompt) is yielded when a worker begins a section,
+        ("usage", name, usage) with its token counts (see complete()) and
+        ("done", name, text) when it finishes. `at` is the time.perf_counter()
+        at which the worker produced the event, so stage timings stay right
+        however long the consumer takes between events. Closing the generator
+        early cancels everything still queued or streaming.
+        """
+        follow_ups = follow_ups or {}
+        deadline = time.monotonic() + timeout if timeout else None
+        events = queue.Queue()
+        cancel = threading.Event()
+        results = {}
+        futures = []
+
+        def submit(name, prompt):
+            futures.append(self._executor.submit(self._run, name, prompt, events, cancel, deltas))
+
+        for name, prompt in prompts.items():
+            submit(name, prompt)
+        outstanding = len(prompts)
+
+        try:
+            while outstanding:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                try:
+                    if remaining is not None and remaining <= 0:
+                        raise queue.Empty
+                    kind, name, payload, at = events.get(timeout=remaining)
+                except queue.Empty:
+                    raise GenerationError(f"Report generation timed out after {timeout}s", results) from None
+
+                if kind == "error":
+                    raise GenerationError(f"{name} failed: {payload}", results) from payload
+                if kind != "done":
+                    yield kind, name, payload, at
+                    continue
+
+                outstanding -= 1
+                results[name] = payload
+                for follow_name, (source, build_prompt) in follow_ups.items():
+                    if source == name:
+                        submit(follow_name, build_prompt(payload))
+                        outstanding += 1
+                yield kind, name, payload, at
+        finally:
+            # --- Stop whatever is still queued or streaming (no-op on success) ---
+            cancel.set()
+            for future in futures:
+                future.cancel()
+
+    def generate(self, prompts, follow_ups=None, timeout=None, on_usage=None):
+        """Generate every section and return them as {name: text}.
+
+        `on_usage` is called as on_usage(name, usage) for every completion.
+        """
+        results = {}
+        for kind, name, payload, _ in self.stream(prompts, follow_ups, timeout, deltas=False):
+            if kind == "done":
+                results[name] = payload
+            elif kind == "usage" and on_usage is not None:
+                on_usage(name, payload)
+        return results
+
+    def generate_structured(self, prompt, model_cls, timeout=None, on_usage=None):
+        """Run one JSON-mode completion and validate it into `model_cls`."""
+        future = self._executor.submit(
+            self.complete, prompt, response_format={"type": "json_object"}, on_usage=on_usage
+        )
+        try:
+            text = future.result(timeout=timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            raise GenerationError(f"Structured generation timed out after {timeout}s") from None
+        except Exception as e:
+            raise GenerationError(f"structured generation failed: {e}") from e
+        try:
+            return model_cls.model_validate_json(text)
+        except ValueError as e:
+            raise GenerationError(f"Structured response did not match the schema: {e}") from e
+
+    def _run(self, name, prompt, events, cancel, deltas):
+        if cancel.is_set():
+            return
+
+        def put(kind, payload):
+            events.put((kind, name, payload, time.perf_counter()))
+
+        put("start", prompt)
+        on_delta = (lambda chunk: put("delta", chunk)) if deltas else None
+        try:
+            text = self.complete(prompt, on_delta=on_delta, cancel=cancel, on_usage=lambda usage: put("usage", usage))
+        except GenerationCancelled:
+            return
+        except Exception as e:
+            put("error", e)
+        else:
+            put("done", text)
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _read_usage(response, usage):
+    if getattr(response, "usage", None) is not None:
+        usage["prompt_tokens"] = response.usage.prompt_tokens
+        usage["completion_tokens"] = response.usage.completion_tokens
+        details = getattr(response.usage, "prompt_tokens_details", None)
+        usage["cached_tokens"] = (getattr(details, "cached_tokens", None) or 0) if details is not None else 0
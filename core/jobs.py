@@ -0,0 +1,94 @@
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+
+class QueueFull(Exception):
+    pass
+
+
+class Job:
+    """One queued unit of work and its outcome."""
+
+    def __init__(self, fn, args, kwargs):
+        self.id = uuid.uuid4().hex
+        self.status = "queued"  # queued -> running -> done | failed
+        self.result = None
+        self.error = None
+        self.exception = None
+        self.created = time.time()
+        self.started = None
+        self.finished = None
+        self._fn = fn
+        self._args = args
+        self._kwargs = kwargs
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "status": self.status,
+            "error": self.error,
+            "created": self.created,
+            "started": self.started,
+            "finished": self.finished,
+        }
+
+
+class JobQueue:
+    """Bounded worker pool with a job table.
+
+    At most `max_pending` jobs may be queued or running; `submit()` raises
+    QueueFull beyond that so callers can push back instead of piling up work.
+    Finished jobs are kept for `ttl` seconds so their results can be fetched.
+    """
+
+    def __init__(self, max_workers=4, max_pending=100, ttl=3600):
+        self.max_pending = max_pending
+        self.ttl = ttl
+        self._jobs = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="job")
+
+    def submit(self, fn, *args, **kwargs):
+        job = Job(fn, args, kwargs)
+        with self._lock:
+            self._prune()
+            if self._count("queued", "running") >= self.max_pending:
+                raise QueueFull(f"{self.max_pending} jobs already pending")
+            self._jobs[job.id] = job
+        self._executor.submit(self._run, job)
+        return job
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def stats(self):
+        with self._lock:
+            return {status: self._count(status) for status in ("queued", "running", "done", "failed")}
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _run(self, job):
+        job.status = "running"
+        job.started = time.time()
+        try:
+            job.result = job._fn(*job._args, **job._kwargs)
+        except Exception as e:
+            job.error = str(e)
+            job.exception = e
+            job.status = "failed"
+        else:
+            job.status = "done"
+        finally:
+            job.finished = time.time()
+
+    def _count(self, *statuses):
+        return sum(1 for job in self._jobs.values() if job.status in statuses)
+
+    def _prune(self):
+        cutoff = time.time() - self.ttl
+        for job_id in [job_id for job_id, job in self._jobs.items() if job.finished and job.finished < cutoff]:
+            del self._jobs[job_id]
@@ -0,0 +1,302 @@
+import os
+from functools import lru_cache
+
+# 리포트 언어 레지스트리: 언어 하나를 추가하려면 여기에 항목 하나만 추가하면 됨
+# (번역 프롬프트, PDF 폰트/문구, 차트 문구, 화면 문구, sanitize 허용 문자가 모두 여기서 만들어짐)
+#
+# address        -- 환자를 한 사람으로 부르도록 하는 번역/답변 규칙
+# organizations  -- WHO/CDC/FDI 기관명 번역 규칙 (뒤에 " if ... mentioned" 가 붙음)
+# safe_chars     -- core.text.SAFE_CHARS 외에 이 언어의 폰트로 출력할 수 있는 문자 (정규식 문자 클래스)
+# pdf            -- core.pdf.ReportRenderer 인자
+# chart          -- core.chart 문구와 폰트
+# ui             -- app.py 탭 문구
+_DEJAVU = {
+    "": "fonts/DejaVuSans.ttf",
+    "B": "fonts/DejaVuSans-Bold.ttf",
+    "I": "fonts/DejaVuSans-Oblique.ttf",
+}
+_CREDIT_ENG = ("Created by Ha-neul Jung | Data sources: World Health Organization(WHO), Centers for Disease Control "
+               "and Prevention(CDC), World Dental Federation(FDI) and publicly available medical datasets")
+
+LANGUAGE_PROFILES = {
+    "eng": {
+        "name": "English",
+        "tab": "🇺🇸 English",
+        "address": "",
+        "organizations": "",
+        "safe_chars": "",
+        "pdf": {
+            "family": "DejaVu",
+            # 등록된 폰트는 사용 여부와 관계없이 output() 때마다 서브셋되므로 실제로 쓰는 스타일만 등록
+            "fonts": _DEJAVU,
+            "title_size": 14,
+            "headings": ["Patient-Friendly Translation", "Awareness & Education"],
+            "disclaimer": "Disclaimer: This report is for educational purposes only and not a substitute for professional medical advice.",
+            "credit": _CREDIT_ENG,
+        },
+        "chart": {
+            "title": "Detected Conditions & Risk Levels",
+            "ylabel": "Risk Score",
+            "font": None,
+            "conditions": {},
+        },
+        "ui": {
+            "explanation": "✅ Patient-Friendly Explanation",
+            "education": "📖 Awareness & Education",
+            "chart": "📊 Detected Health Conditions with Risk Levels",
+            "no_risk": "No high-risk conditions detected in this note.",
+            "download": "⬇️ Download Full Report (PDF)",
+            "chat": "💬 Ask a Question About Your Note",
+            "chat_label": "Type your question here:",
+            "chat_button": "Ask AI",
+            "generating": "Generating the English report... ⏳",
+        },
+    },
+    "kor": {
+        "name": "Korean",
+        "tab": "🇰🇷 Korean",
+        "address": "Aware that the patient is one person not people, so avoid using '여러분'.",
+        "organizations": "Translate CDC into 미국질병통제예방센터(CDC), WHO into 세계보건기구(WHO), FDI into 세계치과의사연맹(FDI)",
+        "safe_chars": "",
+        "pdf": {
+            "family": "NotoSansKR",
+            "fonts": {
+                "": "fonts/NotoSansKR-Regular.ttf",
+                "B": "fonts/NotoSansKR-Bold.ttf",
+                "I": "fonts/NotoSansKR-ExtraLight.ttf",
+            },
+            "title_size": 12,
+            "headings": ["환자 친화적 설명", "환자 교육 및 정보"],
+            "disclaimer": "면책 조항: 이 보고서는 전문적인 의학적 조언을 대신하는 것이 아니라 교육 목적으로만 작성되었습니다.",
+            "credit": "정하늘 작성 | 데이터 출처: 세계보건기구(WHO), 미국질병통제예방센터(CDC), 세계치과의사연맹(FDI)과 공개 의료 데이터셋",
+        },
+        "chart": {
+            "title": "감지된 상태 & 위험 수준",
+            "ylabel": "위험 점수",
+            # 한글은 기본 DejaVu 폰트에 글리프가 없어서 NotoSansKR 사용
+            "font": "fonts/NotoSansKR-Regular.ttf",
+            "conditions": {
+                "hypertension": "고혈압",
+                "diabetes": "당뇨병",
+                "hyperlipidemia": "고지혈증",
+                "asthma": "천식",
+                "obesity": "비만",
+                "kidney_disease": "만성신질환",
+                "heart_failure": "심부전",
+            },
+        },
+        "ui": {
+            "explanation": "✅ 환자 친화적 설명",
+            "education": "📖 환자 교육 및 정보",
+            "chart": "📊 위험 수준에 따른 건강 상태 감지",
+            "no_risk": "이 노트에서는 고위험 조건이 감지되지 않았습니다.",
+            "download": "⬇️ Download Full Report (PDF)",
+            "chat": "💬 궁금한 사항을 더 물어보세요",
+            "chat_label": "질문을 입력해 주세요:",
+            "chat_button": "AI에게 물어보기",
+            "generating": "한국어 리포트 생성중... ⏳ 영어 리포트를 먼저 확인하세요.",
+        },
+    },
+    "zho": {
+        "name": "Simplified Chinese",
+        "tab": "🇨🇳 中文",
+        "address": "Address the patient as one person with '您', and avoid '你们' or '大家'.",
+        "organizations": "Translate CDC into 美国疾病控制与预防中心(CDC), WHO into 世界卫生组织(WHO), FDI into 世界牙科联盟(FDI)",
+        "safe_chars": "\u3000-\u303F\u4E00-\u9FFF\uFF00-\uFFEF",  # CJK 기호, 한자, 전각 문자
+        "pdf": {
+            "family": "NotoSansSC",
+            "fonts": {
+                "": "fonts/NotoSansSC-Regular.ttf",
+                "B": "fonts/NotoSansSC-Bold.ttf",
+                "I": "fonts/NotoSansSC-ExtraLight.ttf",
+            },
+            "title_size": 12,
+            "headings": ["通俗易懂的病情说明", "健康教育与提示"],
+            "disclaimer": "免责声明：本报告仅供教育用途，不能替代专业医疗建议。",
+            "credit": "作者：Ha-neul Jung | 数据来源：世界卫生组织(WHO)、美国疾病控制与预防中心(CDC)、世界牙科联盟(FDI)及公开医疗数据集",
+        },
+        "chart": {
+            "title": "检测到的健康状况与风险等级",
+            "ylabel": "风险评分",
+            "font": "fonts/NotoSansSC-Regular.ttf",
+            "conditions": {
+                "hypertension": "高血压",
+                "diabetes": "糖尿病",
+                "hyperlipidemia": "高脂血症",
+                "asthma": "哮喘",
+                "obesity": "肥胖",
+                "kidney_disease": "慢性肾病",
+                "heart_failure": "心力衰竭",
+            },
+        },
+        "ui": {
+            "explanation": "✅ 通俗易懂的病情说明",
+            "education": "📖 健康教育与提示",
+            "chart": "📊 检测到的健康状况与风险等级",
+            "no_risk": "本病历中未检测到高风险状况。",
+            "download": "⬇️ 下载完整报告 (PDF)",
+            "chat": "💬 关于病历的问题",
+            "chat_label": "请输入您的问题：",
+            "chat_button": "向AI提问",
+            "generating": "正在生成中文报告... ⏳ 请先查看英文报告。",
+        },
+    },
+    "jpn": {
+        "name": "Japanese",
+        "tab": "🇯🇵 日本語",
+        "address": "Address the patient politely as one person, and avoid '皆さん'.",
+        "organizations": "Translate CDC into 米国疾病予防管理センター(CDC), WHO into 世界保健機関(WHO), FDI into 国際歯科連盟(FDI)",
+        "safe_chars": "\u3000-\u303F\u3040-\u30FF\u4E00-\u9FFF\uFF00-\uFFEF",  # CJK 기호, 가나, 한자, 전각 문자
+        "pdf": {
+            "family": "NotoSansJP",
+            "fonts": {
+                "": "fonts/NotoSansJP-Regular.ttf",
+                "B": "fonts/NotoSansJP-Bold.ttf",
+                "I": "fonts/NotoSansJP-ExtraLight.ttf",
+            },
+            "title_size": 12,
+            "headings": ["患者向けのわかりやすい説明", "健康教育と情報"],
+            "disclaimer": "免責事項：本レポートは教育目的のみで作成されたものであり、専門的な医学的助言に代わるものではありません。",
+            "credit": "作成：Ha-neul Jung | データ出典：世界保健機関(WHO)、米国疾病予防管理センター(CDC)、国際歯科連盟(FDI)および公開医療データセット",
+        },
+        "chart": {
+            "title": "検出された健康状態とリスクレベル",
+            "ylabel": "リスクスコア",
+            "font": "fonts/NotoSansJP-Regular.ttf",
+            "conditions": {
+                "hypertension": "高血圧",
+                "diabetes": "糖尿病",
+                "hyperlipidemia": "脂質異常症",
+                "asthma": "喘息",
+                "obesity": "肥満",
+                "kidney_disease": "慢性腎臓病",
+                "heart_failure": "心不全",
+            },
+        },
+        "ui": {
+            "explanation": "✅ 患者向けのわかりやすい説明",
+            "education": "📖 健康教育と情報",
+            "chart": "📊 検出された健康状態とリスクレベル",
+            "no_risk": "このメモでは高リスクの状態は検出されませんでした。",
+            "download": "⬇️ レポート全文をダウンロード (PDF)",
+            "chat": "💬 メモについて質問する",
+            "chat_label": "質問を入力してください：",
+            "chat_button": "AIに質問する",
+            "generating": "日本語レポートを作成中... ⏳ 先に英語レポートをご確認ください。",
+        },
+    },
+    "vie": {
+        "name": "Vietnamese",
+        "tab": "🇻🇳 Tiếng Việt",
+        "address": "Address the patient as one person with 'bạn', and avoid 'các bạn'.",
+        "organizations": "Translate CDC into Trung tâm Kiểm soát và Phòng ngừa Dịch bệnh Hoa Kỳ (CDC), "
+                         "WHO into Tổ chức Y tế Thế giới (WHO), FDI into Liên đoàn Nha khoa Thế giới (FDI)",
+        "safe_chars": "\u00C0-\u024F\u0300-\u036F\u1EA0-\u1EFF",  # 라틴 확장, 성조 부호, 베트남어 문자
+        # DejaVu 에 베트남어 성조 문자가 모두 있음
+        "pdf": {
+            "family": "DejaVu",
+            "fonts": _DEJAVU,
+            "title_size": 14,
+            "headings": ["Giải thích dễ hiểu cho bệnh nhân", "Thông tin và hướng dẫn sức khỏe"],
+            "disclaimer": "Tuyên bố miễn trừ trách nhiệm: Báo cáo này chỉ nhằm mục đích giáo dục và không thay thế "
+                          "cho lời khuyên y tế chuyên môn.",
+            "credit": "Tác giả: Ha-neul Jung | Nguồn dữ liệu: Tổ chức Y tế Thế giới (WHO), Trung tâm Kiểm soát và "
+                      "Phòng ngừa Dịch bệnh Hoa Kỳ (CDC), Liên đoàn Nha khoa Thế giới (FDI) và các bộ dữ liệu y tế công khai",
+        },
+        "chart": {
+            "title": "Các tình trạng được phát hiện & mức độ nguy cơ",
+            "ylabel": "Điểm nguy cơ",
+            "font": None,
+            "conditions": {
+                "hypertension": "Tăng huyết áp",
+                "diabetes": "Đái tháo đường",
+                "hyperlipidemia": "Rối loạn mỡ máu",
+                "asthma": "Hen suyễn",
+                "obesity": "Béo phì",
+                "kidney_disease": "Bệnh thận mạn",
+                "heart_failure": "Suy tim",
+            },
+        },
+        "ui": {
+            "explanation": "✅ Giải thích dễ hiểu cho bệnh nhân",
+            "education": "📖 Thông tin và hướng dẫn sức khỏe",
+            "chart": "📊 Các tình trạng sức khỏe được phát hiện theo mức độ nguy cơ",
+            "no_risk": "Không phát hiện tình trạng nguy cơ cao trong ghi chú này.",
+            "download": "⬇️ Tải báo cáo đầy đủ (PDF)",
+            "chat": "💬 Đặt câu hỏi về ghi chú của bạn",
+            "chat_label": "Nhập câu hỏi của bạn:",
+            "chat_button": "Hỏi AI",
+            "generating": "Đang tạo báo cáo tiếng Việt... ⏳ Vui lòng xem báo cáo tiếng Anh trước.",
+        },
+    },
+    "rus": {
+        "name": "Russian",
+        "tab": "🇷🇺 Русский",
+        "address": "Address the patient as one person with the polite 'Вы'.",
+        "organizations": "Translate CDC into Центры по контролю и профилактике заболеваний США (CDC), "
+                         "WHO into Всемирная организация здравоохранения (ВОЗ), FDI into Всемирная стоматологическая федерация (FDI)",
+        "safe_chars": "\u0400-\u04FF«»№",  # 키릴 문자
+        "pdf": {
+            "family": "DejaVu",
+            "fonts": _DEJAVU,
+            "title_size": 14,
+            "headings": ["Понятное объяснение для пациента", "Информация и рекомендации"],
+            "disclaimer": "Отказ от ответственности: этот отчёт предназначен только для образовательных целей и не "
+                          "заменяет профессиональную медицинскую консультацию.",
+            "credit": "Автор: Ha-neul Jung | Источники данных: Всемирная организация здравоохранения (ВОЗ), Центры по "
+                      "контролю и профилактике заболеваний США (CDC), Всемирная стоматологическая федерация (FDI) "
+                      "и открытые медицинские наборы данных",
+        },
+        "chart": {
+            "title": "Выявленные состояния и уровни риска",
+            "ylabel": "Оценка риска",
+            "font": None,
+            "conditions": {
+                "hypertension": "Гипертония",
+                "diabetes": "Диабет",
+                "hyperlipidemia": "Гиперлипидемия",
+                "asthma": "Астма",
+                "obesity": "Ожирение",
+                "kidney_disease": "Хроническая болезнь почек",
+                "heart_failure": "Сердечная недостаточность",
+            },
+        },
+        "ui": {
+            "explanation": "✅ Понятное объяснение для пациента",
+            "education": "📖 Информация и рекомендации",
+            "chart": "📊 Выявленные состояния и уровни риска",
+            "no_risk": "В этой записи не выявлено состояний высокого риска.",
+            "download": "⬇️ Скачать полный отчёт (PDF)",
+            "chat": "💬 Задать вопрос о записи врача",
+            "chat_label": "Введите ваш вопрос:",
+            "chat_button": "Спросить ИИ",
+            "generating": "Создаётся отчёт на русском... ⏳ Сначала ознакомьтесь с отчётом на английском.",
+        },
+    },
+}
+
+
+def available_languages():
+    """Registered languages whose PDF fonts are in fonts/ and cover the profile's own headings."""
+    return [
+        lang for lang, profile in LANGUAGE_PROFILES.items()
+        if all(font_covers(path, "".join(profile["pdf"]["headings"])) for path in profile["pdf"]["fonts"].values())
+    ]
+
+
+def font_covers(path, text):
+    """True if the font file at `path` exists and has a glyph for every non-space character of `text`."""
+    # 파일 이름만 맞는 다른 폰트(예: DejaVu 를 NotoSansKR 이름으로 복사)는 글자가 네모로 나오므로 cmap 까지 확인
+    if not os.path.exists(path):
+        return False
+    codepoints = _font_codepoints(path, os.path.getmtime(path))
+    return all(ord(ch) in codepoints for ch in text if not ch.isspace())
+
+
+@lru_cache(maxsize=64)
+def _font_codepoints(path, mtime):
+    # app.py 는 매 rerun 마다 호출하므로 파일(수정 시각)별로 한 번만 읽음; fontTools 는 첫 화면 import 를 늘리지 않게 여기서 import
+    from fontTools.ttLib import TTFont
+
+    with TTFont(path, lazy=True) as font:
+        return frozenset(font.getBestCmap())
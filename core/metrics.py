@@ -0,0 +1,129 @@
+import csv
+import io
+import threading
+import time
+import uuid
+from collections import deque
+
+# USD per 1M tokens (input, cached input, output). 모르는 모델은 비용 0 으로 집계
+MODEL_PRICES = {
+    "gpt-3.5-turbo": (0.50, 0.50, 1.50),
+    "gpt-4o-mini": (0.15, 0.075, 0.60),
+    "gpt-4o": (2.50, 1.25, 10.00),
+}
+
+FIELDS = [
+    "time", "session", "report", "source", "stage", "language", "model",
+    "prompt_tokens", "cached_tokens", "completion_tokens", "total_tokens", "seconds", "cost_usd", "cached",
+]
+
+
+def cost_usd(model, prompt_tokens, completion_tokens, cached_tokens=0):
+    input_price, cached_price, output_price = MODEL_PRICES.get(model, (0.0, 0.0, 0.0))
+    uncached = prompt_tokens - cached_tokens
+    return (uncached * input_price + cached_tokens * cached_price + completion_tokens * output_price) / 1_000_000
+
+
+class MetricsStore:
+    """In-memory log of token usage per completion, bounded to `max_rows`.
+
+    Every row is one LLM call (or one fully cached report, with zero tokens)
+    tagged with the session, report, stage, language and model, so usage can
+    be grouped any of those ways or exported as CSV.
+    """
+
+    def __init__(self, max_rows=20000):
+        self._rows = deque(maxlen=max_rows)
+        self._lock = threading.Lock()
+
+    def record(self, stage, language, model, prompt_tokens=0, completion_tokens=0, seconds=0.0,
+               session=None, report=None, source="app", cached=False, cached_tokens=0):
+        row = {
+            "time": time.time(),
+            "session": session,
+            "report": report,
+            "source": source,
+            "stage": stage,
+            "language": language,
+            "model": model,
+            "prompt_tokens": prompt_tokens,
+            "cached_tokens": cached_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+            "seconds": seconds,
+            "cost_usd": cost_usd(model, prompt_tokens, completion_tokens, cached_tokens),
+            "cached": cached,
+        }
+        with self._lock:
+            self._rows.append(row)
+
+    def record_report(self, report, model, session=None, source="app", report_id=None, languages=None):
+        """Log every call of a core.pipeline.Report; returns the report id.
+
+        Pass `report_id` (and the `languages` to log) to add a language that
+        was generated later to an already recorded report.
+        """
+        report_id = report_id or uuid.uuid4().hex[:12]
+        for usage in report.usage:
+            if languages is None or usage["language"] in languages:
+                self.record(session=session, report=report_id, source=source, **usage)
+        for lang in report.cached_languages:
+            if languages is None or lang in languages:
+                self.record("cache", lang, model, session=session, report=report_id, source=source, cached=True)
+        return report_id
+
+    def rows(self):
+        with self._lock:
+            return list(self._rows)
+
+    def by(self, *keys):
+        """Totals grouped by the given row keys, e.g. by("stage", "language")."""
+        groups = {}
+        for row in self.rows():
+            group = groups.setdefault(tuple(row[key] for key in keys), {
+                **{key: row[key] for key in keys},
+                "calls": 0, "prompt_tokens": 0, "cached_tokens": 0, "completion_tokens": 0, "total_tokens": 0,
+                "seconds": 0.0, "cost_usd": 0.0,
+            })
+            if not row["cached"]:
+                group["calls"] += 1
+            for field in ("prompt_tokens", "cached_tokens", "completion_tokens", "total_tokens", "seconds", "cost_usd"):
+                group[field] += row[field]
+        for group in groups.values():
+            # 프롬프트 캐시에서 처리된 입력 토큰 비율
+            group["cached_token_rate"] = group["cached_tokens"] / group["prompt_tokens"] if group["prompt_tokens"] else 0.0
+            # 응답 토큰당 지연 시간 (스트리밍 속도 비교용)
+            completion = group["completion_tokens"]
+            group["ms_per_token"] = group["seconds"] * 1000 / completion if completion else 0.0
+        return list(groups.values())
+
+    def summary(self):
+        rows = self.rows()
+        reports = {row["report"] for row in rows if row["report"] is not None}
+        cached = {row["report"] for row in rows if row["cached"]} - {row["report"] for row in rows if not row["cached"]}
+        tokens = sum(row["total_tokens"] for row in rows)
+        report_tokens = sum(row["total_tokens"] for row in rows if row["report"] is not None)
+        completion = sum(row["completion_tokens"] for row in rows)
+        prompt = sum(row["prompt_tokens"] for row in rows)
+        seconds = sum(row["seconds"] for row in rows)
+        return {
+            "reports": len(reports),
+            "cached_reports": len(cached),
+            "calls": sum(1 for row in rows if not row["cached"]),
+            "total_tokens": tokens,
+            "tokens_per_report": report_tokens / len(reports) if reports else 0.0,
+            "ms_per_token": seconds * 1000 / completion if completion else 0.0,
+            "cached_token_rate": sum(row["cached_tokens"] for row in rows) / prompt if prompt else 0.0,
+            "cost_usd": sum(row["cost_usd"] for row in rows),
+        }
+
+    def to_csv(self):
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=FIELDS)
+        writer.writeheader()
+        writer.writerows(self.rows())
+        return buffer.getvalue()
+
+    def clear(self):
+        with self._lock:
+            self._rows.clear()
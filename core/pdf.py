@@ -0,0 +1,106 @@
+import copy
+import io
+import threading
+
+from fontTools import ttLib
+from fpdf import FPDF
+from fpdf.enums import XPos, YPos
+
+from core.languages import LANGUAGE_PROFILES
+
+# 언어별 폰트/제목/면책 문구는 core.languages 레지스트리에서
+REPORT_LAYOUTS = {lang: profile["pdf"] for lang, profile in LANGUAGE_PROFILES.items()}
+
+
+class ReportRenderer:
+    """Renders patient report PDFs from a prebuilt, font-loaded template.
+
+    The TTF files are read and parsed once when the renderer is built. Each
+    report starts from a copy of a template page that already has the fonts
+    registered and the title drawn, so only the variable sections, the
+    disclaimer and the credit line are laid out per request.
+
+    One renderer is shared by all threads of the process, and render() holds
+    a per-renderer lock: the per-report copies still share fpdf objects with
+    the template, and output() assigns object ids on them.
+    """
+
+    def __init__(self, family, fonts, headings, disclaimer, credit, title="Patient Report", title_size=14):
+        self.family = family
+        self.headings = headings
+        self.disclaimer = disclaimer
+        self.credit = credit
+        # 렌더링은 CPU 작업이라 (GIL) 직렬화해도 처리량 손실이 거의 없음
+        self._lock = threading.Lock()
+
+        template = FPDF()
+        template.add_page()
+        for style, path in fonts.items():
+            template.add_font(family, style, path)
+        template.set_font(family, size=title_size)
+        template.set_text_color(0, 51, 102)
+        template.cell(0, 12, title, new_x=XPos.LMARGIN, new_y=YPos.NEXT, align="C")
+        template.ln(8)
+        self._template = template
+
+        # 원본 TTF 바이트는 보관해 두고, 리포트마다 서브셋용 TTFont 만 새로 연다
+        self._font_data = {}
+        for font in template.fonts.values():
+            with open(font.ttffile, "rb") as f:
+                self._font_data[font.fontkey] = f.read()
+
+    @classmethod
+    def from_layout(cls, name):
+        return cls(**REPORT_LAYOUTS[name])
+
+    def render(self, sections):
+        """Lay out one body text per heading and return the PDF as bytes."""
+        with self._lock:
+            return self._render(sections)
+
+    def _render(self, sections):
+        pdf = self._new_document()
+
+        for heading, text in zip(self.headings, sections):
+            pdf.set_font(self.family, size=14, style="B")
+            pdf.cell(0, 10, heading, new_x=XPos.LMARGIN, new_y=YPos.NEXT, align="C")
+            pdf.set_font(self.family, size=12)
+            pdf.multi_cell(0, 8, text)
+            pdf.ln(4)
+
+        pdf.set_font(self.family, size=10, style="I")
+        pdf.set_text_color(100, 100, 100)
+        pdf.multi_cell(0, 6, self.disclaimer)
+        pdf.ln(3)
+        pdf.set_font(self.family, size=10, style="I")
+        pdf.set_text_color(120, 120, 120)
+        page_width = pdf.w - 2 * pdf.l_margin  # page width minus left/right margins
+        pdf.multi_cell(page_width, 6, self.credit, align="R")
+
+        return bytes(pdf.output())
+
+    def _new_document(self):
+        # 파싱 결과(cmap, 글자 폭, glyph id)는 공유하고, output() 시 서브셋으로
+        # 변형되는 ttfont 와 문서별 사용 글자 목록(subset)만 문서마다 새로 만든다
+        memo = {}
+        for font in self._template.fonts.values():
+            clone = copy.copy(font)
+            clone.ttfont = ttLib.TTFont(
+                io.BytesIO(self._font_data[font.fontkey]), recalcTimestamp=False, fontNumber=0, lazy=True
+            )
+            clone.missing_glyphs = list(font.missing_glyphs)
+            memo[id(font)] = clone
+            clone.subset = copy.deepcopy(font.subset, memo)
+        return copy.deepcopy(self._template, memo)
+
+
+_renderers = {}
+_renderers_lock = threading.Lock()
+
+
+def get_renderer(name):
+    """Return the process-wide renderer for a layout in REPORT_LAYOUTS."""
+    with _renderers_lock:
+        if name not in _renderers:
+            _renderers[name] = ReportRenderer.from_layout(name)
+        return _renderers[name]
@@ -0,0 +1,382 @@
+import functools
+import os
+import threading
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+
+from pydantic import BaseModel, create_model
+
+from core.cache import ReportCache
+from core.chunking import CHUNK_TOKEN_BUDGET, merge_bullets, split_lines, split_note
+from core.engine import GenerationEngine, GenerationError
+from core.pdf import get_renderer
+from core.languages import LANGUAGE_PROFILES, available_languages
+from core.prompts import (
+    build_edu_eng_prompt,
+    build_edu_prompt,
+    build_structured_prompt,
+    build_translation_eng_prompt,
+    build_translation_prompt,
+    prompt_version,
+)
+from core.stages import StageTracker
+from core.text import sanitize_text
+
+SOURCE_LANGUAGE = "eng"
+# core.languages 에 등록되어 있고 PDF 폰트 파일도 있는 언어
+SUPPORTED_LANGUAGES = tuple(available_languages())
+# 기본 리포트 언어 (쉼표로 구분, "eng, kor" 처럼 공백이 있어도 됨)
+# 폰트가 없는 언어는 기본값에서 빼고 경고만 남김 (그대로 두면 모든 요청이 ValueError/422 로 실패)
+_CONFIGURED_LANGUAGES = [lang.strip() for lang in os.getenv("REPORT_LANGUAGES", "eng,kor").split(",") if lang.strip()]
+LANGUAGES = tuple(lang for lang in _CONFIGURED_LANGUAGES if lang in SUPPORTED_LANGUAGES)
+if len(LANGUAGES) < len(_CONFIGURED_LANGUAGES):
+    warnings.warn(
+        "Dropping report language(s) without registry entry or PDF fonts: "
+        + ", ".join(lang for lang in _CONFIGURED_LANGUAGES if lang not in SUPPORTED_LANGUAGES),
+        RuntimeWarning,
+    )
+SECTIONS = ("translation", "education")
+
+# "four_call": 영어 2회 + 번역 2회 (스트리밍 가능)
+# "single_call": JSON 스키마 응답 1회로 모든 언어/섹션 생성 (왕복 1회, 입력 토큰 약 절반)
+GENERATION_MODES = ("four_call", "single_call")
+GENERATION_MODE = os.getenv("REPORT_GENERATION_MODE", "four_call")
+
+# 영어는 메모에서 바로 생성하고, 다른 언어는 (sanitize 된) 영어 결과를 번역
+SOURCE_PROMPTS = {
+    "translation": build_translation_eng_prompt,
+    "education": build_edu_eng_prompt,
+}
+# 캐시 키에 넣는 템플릿 이름 (core.prompts.PROMPTS)
+SOURCE_TEMPLATES = [f"{section}_{SOURCE_LANGUAGE}" for section in SECTIONS]
+STRUCTURED_TEMPLATES = ["structured"]
+TRANSLATION_PROMPTS = {
+    lang: {
+        "translation": functools.partial(build_translation_prompt, lang),
+        "education": functools.partial(build_edu_prompt, lang),
+    }
+    for lang in LANGUAGE_PROFILES
+    if lang != SOURCE_LANGUAGE
+}
+
+
+@dataclass
+class Report:
+    """Sanitized section text and PDF bytes for each generated language."""
+
+    note: str
+    sections: dict  # {lang: {"translation": str, "education": str}}
+    pdfs: dict  # {lang: bytes}
+    cached_languages: list = field(default_factory=list)
+    timings: list = field(default_factory=list)  # [(stage, seconds)]
+    # 호출별 토큰 사용량 [{"stage", "language", "model", "prompt_tokens", "completion_tokens", "seconds"}]
+    usage: list = field(default_factory=list)
+
+    @property
+    def cached(self):
+        return set(self.cached_languages) == set(self.sections)
+
+
+class LanguageSections(BaseModel):
+    translation: str
+    education: str
+
+
+def structured_model(languages):
+    """Pydantic model of the single-call response: {lang: LanguageSections}."""
+    return create_model("StructuredReport", **{lang: (LanguageSections, ...) for lang in languages})
+
+
+def calls_per_report(languages=LANGUAGES):
+    """Completions one report can have in flight at once, for sizing worker pools.
+
+    The two English sections run together, then every other language's two
+    translations run together as soon as their English section is done.
+    """
+    return len(SECTIONS) * max(1, len(_with_source(languages)) - 1)
+
+
+def language_stages(lang, mode=GENERATION_MODE):
+    llm_stages = [f"llm:{section}_{lang}" for section in SECTIONS] if mode == "four_call" else []
+    return llm_stages + [f"pdf_{lang}"]
+
+
+def report_stages(languages=LANGUAGES, mode=GENERATION_MODE):
+    """Stages a report goes through when nothing is cached (for progress)."""
+    stages = ["cache_lookup", "prompt_build"]
+    if mode == "single_call":
+        stages.append("llm:structured")
+    for lang in _with_source(languages):
+        stages += language_stages(lang, mode)
+    # four_call 은 언어마다 섹션이 끝나는 대로 pdf_<lang> 단계에서 sanitize
+    return stages + (["sanitize"] if mode == "single_call" else [])
+
+
+_default_engine = None
+_default_engine_lock = threading.Lock()
+
+
+def default_engine():
+    global _default_engine
+    with _default_engine_lock:
+        if _default_engine is None:
+            _default_engine = GenerationEngine.from_env()
+        return _default_engine
+
+
+def generate_report(note, languages=LANGUAGES, engine=None, cache=None, on_delta=None, tracker=None, timeout=180,
+                    mode=None, partial=None, chunk_tokens=CHUNK_TOKEN_BUDGET):
+    """Generate the patient report for one doctor's note.
+
+    languages -- report languages; English is always generated because the
+                 other languages are translated from it
+    engine    -- GenerationEngine to run the completions on (process default)
+    cache     -- optional ReportCache; each language is cached separately
+    on_delta  -- streaming callback on_delta(lang, section, chunk); not
+                 called in single_call mode, which cannot stream sections
+    tracker   -- StageTracker receiving per-stage timings
+    mode      -- "four_call" or "single_call" (REPORT_GENERATION_MODE)
+    partial   -- GenerationError.partial of a failed attempt for the same
+                 note; only the sections missing from it are requested again
+    chunk_tokens -- notes longer than this (estimated tokens) are split at
+                 section boundaries, the English sections are generated per
+                 chunk in parallel and merged; long notes always use four_call.
+                 An English section longer than this is translated in parts
+                 (split between bullets) in parallel and joined
+
+    Returns a Report. Raises core.engine.GenerationError if a call fails; its
+    `partial` holds every section finished so far.
+    """
+    languages = _with_source(languages)
+    mode = mode or GENERATION_MODE
+    if mode not in GENERATION_MODES:
+        raise ValueError(f"Unknown generation mode: {mode}")
+    engine = engine or default_engine()
+    tracker = tracker or StageTracker()
+
+    # --- Cache lookup (언어별로 따로 저장) ---
+    # 캐시 키에는 그 언어의 텍스트를 실제로 만든 템플릿의 버전만 넣음
+    # (언어를 추가해도 기존 언어의 캐시는 유지되고, 번역 템플릿을 바꾸면 그 번역만 무효화)
+    sections, pdfs, cached_languages = {}, {}, []
+    produced_by = {}  # {lang: 텍스트를 만든 템플릿 이름}
+    with tracker.stage("cache_lookup"):
+        for lang in languages:
+            for names in _template_candidates(lang, mode) if cache is not None else ():
+                entry = cache.get(_cache_key(note, names, engine, lang))
+                if entry is not None:
+                    sections[lang] = entry["sections"]
+                    pdfs[lang] = entry["pdfs"]
+                    cached_languages.append(lang)
+                    produced_by[lang] = names
+                    tracker.skip(language_stages(lang, mode))
+                    break
+
+    missing = [lang for lang in languages if lang not in sections]
+    if not missing:
+        tracker.skip(["prompt_build", "llm:structured", "sanitize"])
+        return Report(note, sections, pdfs, cached_languages, tracker.summary())
+
+    def render(lang):
+        with tracker.stage(f"pdf_{lang}"):
+            pdfs[lang] = get_renderer(lang).render([sections[lang][section] for section in SECTIONS])
+        if cache is not None:
+            cache.set(_cache_key(note, produced_by[lang], engine, lang), {"sections": sections[lang], "pdfs": pdfs[lang]})
+
+    chunks = split_note(note, chunk_tokens) if SOURCE_LANGUAGE in missing else [note]
+    usage = []
+    if mode == "single_call" and SOURCE_LANGUAGE in missing and len(chunks) == 1:
+        produced_by.update({lang: STRUCTURED_TEMPLATES for lang in missing})
+        _generate_structured(engine, note, missing, sections, tracker, timeout, usage)
+        for lang in missing:
+            render(lang)
+    else:
+        # 번역은 (캐시된 것이든 지금 만든 것이든) 영어 결과에서 만들어지므로 영어를 만든 템플릿도 포함
+        produced_by.setdefault(SOURCE_LANGUAGE, SOURCE_TEMPLATES)
+        for lang in missing:
+            if lang != SOURCE_LANGUAGE:
+                produced_by[lang] = produced_by[SOURCE_LANGUAGE] + _translation_templates(lang)
+        tracker.skip(["llm:structured", "sanitize"])
+        _generate_four_call(engine, chunks, missing, sections, tracker, timeout, on_delta, partial or {}, usage, render,
+                            chunk_tokens)
+
+    return Report(note, sections, pdfs, cached_languages, tracker.summary(), usage)
+
+
+def _translation_templates(lang):
+    return [f"{section}_{lang}" for section in SECTIONS]
+
+
+def _template_candidates(lang, mode):
+    """Template sets that may have produced a cached `lang`, most preferred first.
+
+    single_call writes every language straight from the structured prompt,
+    but a language added later is translated from the cached structured
+    English, and long notes always go through the four_call prompts.
+    """
+    four_call = SOURCE_TEMPLATES if lang == SOURCE_LANGUAGE else SOURCE_TEMPLATES + _translation_templates(lang)
+    if mode != "single_call":
+        return [four_call]
+    if lang == SOURCE_LANGUAGE:
+        return [STRUCTURED_TEMPLATES, four_call]
+    return [STRUCTURED_TEMPLATES, STRUCTURED_TEMPLATES + _translation_templates(lang), four_call]
+
+
+def _cache_key(note, templates, engine, lang):
+    return ReportCache.make_key(note, prompt_version(templates), engine.model, lang)
+
+
+def _usage_row(engine, stage, language, usage):
+    return {"stage": stage, "language": language, "model": engine.model, **usage}
+
+
+def _generate_structured(engine, note, missing, sections, tracker, timeout, usage):
+    model_cls = structured_model(missing)
+    with tracker.stage("prompt_build"):
+        prompt = build_structured_prompt(note, missing, model_cls.model_json_schema())
+    with tracker.stage("llm:structured"):
+        result = engine.generate_structured(
+            prompt, model_cls, timeout=timeout,
+            on_usage=lambda counts: usage.append(_usage_row(engine, "llm:structured", ",".join(missing), counts)),
+        )
+    with tracker.stage("sanitize"):
+        for lang in missing:
+            generated = getattr(result, lang)
+            sections[lang] = {
+                section: sanitize_text(getattr(generated, section).strip(), lang) for section in SECTIONS
+            }
+
+
+def _generate_four_call(engine, chunks, missing, sections, tracker, timeout, on_delta, partial, usage, render,
+                        chunk_tokens):
+    # --- OpenAI API calls ---
+    # 영어 두 섹션은 동시에 요청하고, 각 번역은 해당 영어 결과가 도착하는 즉시 시작
+    # 이전 시도에서 끝난 섹션(partial)은 다시 요청하지 않음
+    raw = {
+        f"{section}_{lang}": partial[f"{section}_{lang}"]
+        for lang in missing
+        for section in SECTIONS
+        if f"{section}_{lang}" in partial
+    }
+    tracker.skip([f"llm:{name}" for name in raw])
+    if len(chunks) > 1:
+        # 긴 메모: 청크별 영어 섹션을 한꺼번에 요청하고 병합한 뒤 번역 (청크 결과는 스트리밍하지 않음)
+        needed = [section for section in SECTIONS if f"{section}_{SOURCE_LANGUAGE}" not in raw]
+        raw.update(_generate_chunked(engine, chunks, needed, tracker, timeout, usage))
+    if on_delta is not None:
+        for name, text in raw.items():
+            section, lang = name.rsplit("_", 1)
+            on_delta(lang, section, sanitize_text(text, lang))
+    with tracker.stage("prompt_build"):
+        prompts, follow_ups = {}, {}
+        parts = {}  # {번역 이름: 나눠서 번역하는 조각 수}
+        for section in SECTIONS:
+            source_name = f"{section}_{SOURCE_LANGUAGE}"
+            if SOURCE_LANGUAGE in missing and source_name not in raw:
+                prompts[source_name] = SOURCE_PROMPTS[section](chunks[0])
+            for lang in missing:
+                if lang == SOURCE_LANGUAGE or f"{section}_{lang}" in raw:
+                    continue
+                build_prompt = TRANSLATION_PROMPTS[lang][section]
+                if source_name in prompts:
+                    follow_ups[f"{section}_{lang}"] = (
+                        source_name,
+                        lambda text, build_prompt=build_prompt: build_prompt(sanitize_text(text)),
+                    )
+                else:
+                    # 이미 있는 영어(청크 병합 결과, 이전 시도, 캐시)는 길 수 있으므로 번역도 예산 단위로 나눠서 동시에 요청
+                    # (방금 요청한 영어는 청크 하나에서 나온 응답이라 follow-up 하나로 충분)
+                    source = sanitize_text(raw[source_name]) if source_name in raw else sections[SOURCE_LANGUAGE][section]
+                    pieces = split_lines(source, chunk_tokens)
+                    if len(pieces) == 1:
+                        prompts[f"{section}_{lang}"] = build_prompt(source)
+                        continue
+                    parts[f"{section}_{lang}"] = len(pieces)
+                    for i, piece in enumerate(pieces, start=1):
+                        prompts[f"{section}_{lang}#{i}"] = build_prompt(piece)
+
+    prefilled = [lang for lang in missing if all(f"{section}_{lang}" in raw for section in SECTIONS)]
+    events = engine.stream(prompts, follow_ups=follow_ups, timeout=timeout, deltas=on_delta is not None)
+    # PDF 는 별도 스레드에서 만들어서 렌더링 중에도 다른 언어의 스트리밍이 멈추지 않도록 함
+    # (렌더러 잠금 때문에 어차피 한 번에 하나씩 그려지므로 스레드 하나)
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="pdf") as renders:
+        rendered = []
+        pieces = {}  # {번역 이름: {조각 번호: 텍스트}}
+        try:
+            for kind, name, payload, at in events:
+                name, _, piece = name.partition("#")
+                # 단계 시간은 이벤트가 여기 도착한 시각이 아니라 워커에서 실제로 시작/종료한 시각 기준
+                if kind == "start":
+                    # 나눠서 번역하는 섹션은 첫 조각이 시작할 때부터 마지막 조각이 끝날 때까지가 한 단계
+                    if name not in pieces:
+                        tracker.start(f"llm:{name}", at)
+                    if piece:
+                        pieces.setdefault(name, {})
+                elif kind == "delta" and piece:
+                    # 조각들은 동시에 스트리밍되므로 섞이지 않게 모두 끝난 뒤 한 번에 전달
+                    continue
+                elif kind == "delta":
+                    # sanitize_text 는 문자 단위 치환이라 청크마다 적용해도 전체 텍스트에 적용한 것과 같음
+                    section, lang = name.rsplit("_", 1)
+                    on_delta(lang, section, sanitize_text(payload, lang))
+                elif kind == "usage":
+                    usage.append(_usage_row(engine, f"llm:{name}", name.rsplit("_", 1)[1], payload))
+                elif kind == "done":
+                    if piece:
+                        pieces[name][int(piece)] = payload
+                        if len(pieces[name]) < parts[name]:
+                            continue
+                        payload = "\n".join(pieces[name][i] for i in range(1, parts[name] + 1))
+                        if on_delta is not None:
+                            section, lang = name.rsplit("_", 1)
+                            on_delta(lang, section, sanitize_text(payload, lang))
+                    raw[name] = payload
+                    tracker.finish(f"llm:{name}", at)
+                    # 언어 하나의 섹션이 모두 모이면 다른 언어의 번역을 기다리지 않고 바로 PDF 생성
+                    lang = name.rsplit("_", 1)[1]
+                    if lang not in prefilled and all(f"{section}_{lang}" in raw for section in SECTIONS):
+                        rendered.append(renders.submit(_finish_language, lang, raw, sections, render))
+        except GenerationError as e:
+            # 끝난 조각만 있는 번역은 다음 시도에서 통째로 다시 요청
+            e.partial = {**raw, **{name: text for name, text in e.partial.items() if "#" not in name}}
+            raise
+
+        # 이번 호출 전에 이미 끝나 있던 언어 (이전 시도의 partial, 청크로 만든 영어)
+        for lang in prefilled:
+            rendered.append(renders.submit(_finish_language, lang, raw, sections, render))
+        for future in rendered:
+            future.result()
+
+
+def _finish_language(lang, raw, sections, render):
+    # --- Sanitize AI outputs for display & PDF ---
+    sections[lang] = {section: sanitize_text(raw[f"{section}_{lang}"], lang) for section in SECTIONS}
+    render(lang)
+
+
+def _generate_chunked(engine, chunks, sections_needed, tracker, timeout, usage):
+    prompts = {}
+    for section in sections_needed:
+        for i, chunk in enumerate(chunks, start=1):
+            part = f"[Part {i} of {len(chunks)} of a longer note]\n{chunk}"
+            prompts[f"{section}_{SOURCE_LANGUAGE}#{i}"] = SOURCE_PROMPTS[section](part)
+        tracker.start(f"llm:{section}_{SOURCE_LANGUAGE}")
+
+    def record(name, counts):
+        stage = name.split("#")[0]
+        usage.append(_usage_row(engine, f"llm:{stage}", SOURCE_LANGUAGE, counts))
+
+    results = engine.generate(prompts, timeout=timeout, on_usage=record)
+    merged = {}
+    for section in sections_needed:
+        name = f"{section}_{SOURCE_LANGUAGE}"
+        merged[name] = merge_bullets([results[f"{name}#{i}"] for i in range(1, len(chunks) + 1)])
+        tracker.finish(f"llm:{name}")
+    return merged
+
+
+def _with_source(languages):
+    unknown = [lang for lang in languages if lang not in SUPPORTED_LANGUAGES]
+    if unknown:
+        raise ValueError(f"Unsupported report language(s): {', '.join(unknown)}")
+    return [SOURCE_LANGUAGE] + [lang for lang in languages if lang != SOURCE_LANGUAGE]
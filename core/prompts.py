@@ -0,0 +1,201 @@
+import hashlib
+import json
+from dataclasses import dataclass
+
+from core.languages import LANGUAGE_PROFILES
+
+
+@dataclass(frozen=True)
+class PromptTemplate:
+    """One versioned prompt, split into a static `system` prefix and a
+    per-call `user` part (both str.format templates).
+
+    Everything that is the same for every call goes into `system`, so
+    repeated calls start with an identical prefix that the provider can serve
+    from its prompt cache; only the note (or the English text to translate)
+    goes into `user`. Bump `version` whenever the wording changes.
+    """
+
+    name: str
+    version: str
+    system: str
+    user: str
+
+    def messages(self, **fields):
+        return [
+            {"role": "system", "content": self.system.format(**fields)},
+            {"role": "user", "content": self.user.format(**fields)},
+        ]
+
+
+PROMPTS = {}
+
+
+def register(name, version, system, user):
+    PROMPTS[name] = PromptTemplate(name, version, system, user)
+    return PROMPTS[name]
+
+
+def render(name, **fields):
+    """Chat messages of the registered template `name`."""
+    return PROMPTS[name].messages(**fields)
+
+
+# 언어별 번역 규칙 (core.languages 레지스트리)
+def _address_rules(lang):
+    address = LANGUAGE_PROFILES[lang]["address"]
+    return [address] if address else []
+
+
+def _organization_rules(lang, suffix):
+    organizations = LANGUAGE_PROFILES[lang]["organizations"]
+    return [f"{organizations} {suffix}"] if organizations else []
+
+
+# --- AI Prompts ---
+register(
+    "translation_eng",
+    version="2025-09-1",
+    system="""Based on the Korean doctor's note in the user message, provide a patient-friendly English explanation for the foreign patient in a **clear, bullet point list format**.
+
+Requirements:
+1. Present each point as a separate item for clarity.
+2. Explain medical terms in simple language. And it should be **5-7 sentences long** to provide sufficient detail., e.g.,
+- Instead of just "eGFR", write "eGFR (estimated Glomerular Filtration Rate), which indicates how well the kidneys are working".
+3. Describe why each treatment or medication is suggested. And it should be **5-7 sentences long** to provide sufficient detail.
+- The name of the drug.
+- A simple explanation of what it is for (e.g., "Amlodipine: helps lower blood pressure to reduce strain on the heart").
+- Potential side effects the patient should watch for.
+4. Keep the tone concise, clear, and patient-focused, suitable for direct display in a PDF.""",
+    user="Patient note: {doctor_note_text}",
+)
+
+register(
+    "education_eng",
+    version="2025-09-1",
+    system="""Based on the Korean doctor's note in the user message, provide a patient-friendly English potential risk, guidance for the foreign patient in a **clear, bullet point list format**.
+Do not provide any explantion about doctor's note.
+
+Requirements:
+1. Present each point as a separate item for clarity and must reference and cite public health statistics data from WHO or CDC or open data. Reference FDI World Dental Federation if Doctor's Note related to dental.
+2. Highlight potential risks related to the patient's conditions that are not immediately obvious in **5-7 sentences long** to provide sufficient detail.
+3. Include practical, actionable daily diet tips and lifestyle guidance or work out routines tailored to this patient's conditions, lab results, and age that the patient might not already know **5-7 sentences long** to provide sufficient detail.
+4. Explanations of why certain treatments or lifestyle changes are recommended **3-5 sentences long** to provide sufficient detail.
+5. Keep the tone concise, clear, and patient-focused, suitable for direct display in a PDF.""",
+    user="Patient note: {doctor_note_text}",
+)
+
+# --- Translation prompts for every other registered language (built from the sanitized English output) ---
+for _lang, _profile in LANGUAGE_PROFILES.items():
+    if _lang == "eng":
+        continue
+    _rules = (
+        [f"Translate the doctor's note in the user message to {_profile['name']}."]
+        + _address_rules(_lang)
+        + ["And the response format must follow the english format."]
+    )
+    register(f"translation_{_lang}", version="2025-09-1", system="\n".join(_rules), user="{english_text}")
+    register(
+        f"education_{_lang}",
+        version="2025-09-1",
+        system="\n".join(_rules + _organization_rules(_lang, "if it's mentioned in the note.")),
+        user="{english_text}",
+    )
+
+# --- Single-call structured prompt (all sections, all languages, one JSON response) ---
+STRUCTURED_LANGUAGE_RULES = {"eng": "English."}
+for _lang, _profile in LANGUAGE_PROFILES.items():
+    if _lang != "eng":
+        STRUCTURED_LANGUAGE_RULES[_lang] = " ".join(
+            [f"{_profile['name']}, translated from the English sections with the same bullet format."]
+            + _address_rules(_lang) + _organization_rules(_lang, "if mentioned.")
+        )
+
+register(
+    "structured",
+    version="2025-09-1",
+    system="""Based on the Korean doctor's note in the user message, write a patient-friendly report for the foreign patient.
+Return only one JSON object matching this JSON schema:
+{schema}
+
+Every "translation" and "education" value is a string in a **clear, bullet point list format**, suitable for direct display in a PDF.
+
+"translation" requirements:
+1. Present each point as a separate item for clarity.
+2. Explain medical terms in simple language in **5-7 sentences**, e.g. instead of just "eGFR", write "eGFR (estimated Glomerular Filtration Rate), which indicates how well the kidneys are working".
+3. Describe why each treatment or medication is suggested in **5-7 sentences**: the name of the drug, a simple explanation of what it is for, and potential side effects the patient should watch for.
+
+"education" requirements (do not explain the doctor's note itself):
+1. Present each point as a separate item and cite public health statistics from WHO or CDC or open data. Reference FDI World Dental Federation if the note is related to dental.
+2. Highlight potential risks related to the patient's conditions that are not immediately obvious in **5-7 sentences**.
+3. Include practical daily diet tips and lifestyle guidance or work out routines tailored to this patient's conditions, lab results, and age in **5-7 sentences**.
+4. Explain why certain treatments or lifestyle changes are recommended in **3-5 sentences**.
+
+Languages (top-level keys):
+{language_rules}""",
+    user="Patient note: {doctor_note_text}",
+)
+
+# --- Follow-up Q&A (리포트 맥락은 system 메시지로 한 번만 전달) ---
+CHAT_ANSWER_LANGUAGES = {
+    lang: " ".join([f"Answer in {profile['name']}."] + _address_rules(lang))
+    for lang, profile in LANGUAGE_PROFILES.items()
+}
+
+register(
+    "chat",
+    version="2025-08-1",
+    system="""You are a helpful medical explainer for patients.
+Answer the patient's questions about their doctor's note briefly and in plain language.
+If a question needs a diagnosis or a change of treatment, tell the patient to ask their doctor.
+{answer_language}
+
+Doctor's note: {doctor_note_text}
+
+Patient-friendly explanation already given to the patient:
+{explanation}
+""",
+    user="{question}",
+)
+
+
+def prompt_version(names=None):
+    """Short hash of the versions of the given (default: all) templates."""
+    versions = sorted(f"{name}@{PROMPTS[name].version}" for name in (names or PROMPTS))
+    return hashlib.sha256(",".join(versions).encode("utf-8")).hexdigest()[:12]
+
+
+# 전체 템플릿 버전 (배치 manifest 기록용). 리포트 캐시 키는 core.pipeline 에서 언어별로 쓰는 템플릿만으로 계산
+PROMPT_VERSION = prompt_version()
+
+
+def build_translation_eng_prompt(doctor_note_text):
+    return render("translation_eng", doctor_note_text=doctor_note_text)
+
+
+def build_edu_eng_prompt(doctor_note_text):
+    return render("education_eng", doctor_note_text=doctor_note_text)
+
+
+def build_translation_prompt(lang, translation_eng_safe):
+    return render(f"translation_{lang}", english_text=translation_eng_safe)
+
+
+def build_edu_prompt(lang, edu_eng_safe):
+    return render(f"education_{lang}", english_text=edu_eng_safe)
+
+
+def build_structured_prompt(doctor_note_text, languages, schema):
+    language_rules = "\n".join(f'- "{lang}": {STRUCTURED_LANGUAGE_RULES[lang]}' for lang in languages)
+    return render(
+        "structured",
+        doctor_note_text=doctor_note_text,
+        schema=json.dumps(schema, ensure_ascii=False),
+        language_rules=language_rules,
+    )
+
+
+def build_chat_system_prompt(doctor_note_text, explanation, lang):
+    return PROMPTS["chat"].system.format(
+        answer_language=CHAT_ANSWER_LANGUAGES[lang], doctor_note_text=doctor_note_text, explanation=explanation
+    )
@@ -0,0 +1,50 @@
+import threading
+import time
+
+
+def retry_after(error):
+    """Seconds from the Retry-After header of an API error, or None."""
+    response = getattr(error, "response", None)
+    try:
+        return float(response.headers.get("retry-after"))
+    except (AttributeError, TypeError, ValueError):
+        return None
+
+
+class RateLimiter:
+    """Token bucket that caps how much work starts per minute.
+
+    Every call to `acquire(cost)` takes `cost` tokens (one per request, or the
+    estimated prompt + completion tokens for a tokens-per-minute bucket) and
+    blocks until they are available. `pause(seconds)` holds all callers back,
+    e.g. after the API answered 429 with a Retry-After header.
+    """
+
+    def __init__(self, per_minute, burst=None):
+        # 0 은 "제한 없음" 이므로 limiter 를 만들지 않는 쪽에서 처리 (여기서는 0 으로 나누게 됨)
+        if per_minute <= 0:
+            raise ValueError(f"per_minute must be positive, got {per_minute}")
+        self.rate = per_minute / 60.0
+        self.capacity = burst or per_minute
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self, cost=1):
+        # 한 번에 버킷보다 큰 요청은 가득 찬 버킷으로 통과시킴 (영원히 기다리지 않도록)
+        cost = min(cost, self.capacity)
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if now >= self._blocked_until and self._tokens >= cost:
+                    self._tokens -= cost
+                    return
+                wait = max(self._blocked_until - now, (cost - self._tokens) / self.rate)
+            time.sleep(wait)
+
+    def pause(self, seconds):
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
@@ -0,0 +1,202 @@
+import re
+
+LEVEL_SCORES = {"low": 1, "moderate": 2, "high": 3}
+
+# 조건별 위험 키워드 (영어/한국어). 수치 기준(HbA1c, LDL, BMI, eGFR, EF)은 LAB_THRESHOLDS 에서 판단
+# 병기/중증도 단어("stage 2", "severe", "mild", "2기", "중증", "경증")는 다른 질환에도 쓰이므로
+# 영어/한국어 모두 질환명과 붙은 형태로만 등록
+RISK_KEYWORDS = {
+    "hypertension": {
+        "high": ["stage 2 hypertension", "hypertension stage 2", "hypertension (stage 2)", "severe hypertension",
+                 "hypertensive crisis", "고혈압 2기", "고혈압(2기)", "고혈압 (2기)", "2기 고혈압", "고혈압 위기"],
+        "moderate": ["stage 1 hypertension", "hypertension stage 1", "hypertension (stage 1)", "elevated blood pressure",
+                     "고혈압 1기", "고혈압(1기)", "고혈압 (1기)", "1기 고혈압"],
+        "low": ["borderline hypertension", "borderline blood pressure", "경계성 고혈압"],
+    },
+    "diabetes": {
+        "high": ["insulin", "인슐린"],
+        "moderate": ["metformin", "메트포르민"],
+        "low": ["prediabetes", "당뇨 전단계", "공복혈당장애"],
+    },
+    "hyperlipidemia": {
+        "high": [],
+        "moderate": [],
+        "low": ["borderline cholesterol", "경계성 고지혈증"],
+    },
+    "asthma": {
+        "high": ["status asthmaticus", "severe asthma", "severe persistent asthma", "asthma (severe)", "천식 지속상태",
+                 "중증 천식", "천식(중증)", "천식 (중증)"],
+        "moderate": ["moderate asthma", "moderate persistent asthma", "asthma (moderate)", "중등도 천식", "천식(중등도)",
+                     "천식 (중등도)"],
+        "low": ["mild asthma", "mild intermittent asthma", "mild persistent asthma", "asthma (mild)", "경증 천식",
+                "천식(경증)", "천식 (경증)"],
+    },
+    "obesity": {"high": [], "moderate": [], "low": []},
+    "kidney_disease": {"high": ["dialysis", "투석"], "moderate": [], "low": []},
+    "heart_failure": {"high": [], "moderate": [], "low": []},
+}
+
+# 검사 수치: (별칭, 조건, [(최소값, 최대값, 위험도)]) -- 최소 <= 값 < 최대
+# "EF <40%" 처럼 부등호가 붙은 값은 경계값 바로 안쪽 값으로 판단 (_grade)
+LAB_THRESHOLDS = {
+    "hba1c": (["hba1c", "a1c", "당화혈색소"], "diabetes", [(9, None, "high"), (7, 9, "moderate"), (5.7, 7, "low")]),
+    "ldl": (["ldl-c", "ldl", "저밀도지단백", "저밀도 지단백"], "hyperlipidemia",
+            [(190, None, "high"), (130, 190, "moderate"), (100, 130, "low")]),
+    "bmi": (["bmi", "체질량지수", "체질량 지수"], "obesity", [(35, None, "high"), (30, 35, "moderate"), (25, 30, "low")]),
+    "egfr": (["egfr", "사구체여과율", "사구체 여과율"], "kidney_disease",
+             [(None, 30, "high"), (30, 60, "moderate"), (60, 90, "low")]),
+    "ef": (["lvef", "ef", "박출률", "구혈률"], "heart_failure", [(None, 40, "high"), (40, 50, "moderate")]),
+}
+
+# 검사 이름 주변(앞 12자 ~ 수치)에 있으면 측정값이 아닌 목표/기준치
+TARGET_WORDS = ("목표", "target", "goal")
+COMPARATORS = {"≤": "<=", "≥": ">="}
+# 키워드를 묶는 공통 부분 문자열(anchor)의 최소 길이. 한글은 한 글자가 드물어서 2글자면 충분
+ANCHOR_LENGTH = 4
+HANGUL_ANCHOR_LENGTH = 2
+# 검사 이름 뒤의 사이 글자, 부등호, 수치 (이름과 수치 사이의 부등호는 사이 글자에 포함하지 않음)
+LAB_VALUE_PATTERN = r"(?![a-z])([^\d\n<>≤≥]{0,12}?)(<=|>=|[<>≤≥])?\s*(\d+(?:\.\d+)?)"
+
+
+class RiskScanner:
+    """Scores risk conditions in a doctor's note with one substring search per anchor.
+
+    Keywords and lab names that share a substring (an anchor: "asthma" for
+    every English asthma keyword, "고혈압" for the Korean hypertension ones)
+    are grouped, and a group is only looked at when its anchor is in the
+    note, so an unrelated note costs one str.find per anchor instead of one
+    per keyword (a single regex over all keywords is slower still, since it
+    is tried at almost every character of English text). Keywords are then
+    tested with `keyword in note`, so overlapping keywords are all found.
+    Lab values ("HbA1c 8.2%", "eGFR 42", "EF <40%", "LDL-C: 172 mg/dL",
+    "당화혈색소 9.1") are parsed with their comparator only where a lab name
+    occurs and graded with LAB_THRESHOLDS instead of matching threshold
+    strings literally; targets ("HbA1c 목표 <7%", "target LDL <100") are not
+    measurements and are skipped.
+    """
+
+    def __init__(self, keywords=RISK_KEYWORDS, labs=LAB_THRESHOLDS):
+        self.conditions = list(dict.fromkeys(list(keywords) + [condition for _, condition, _ in labs.values()]))
+        self.labs = labs
+
+        hits = {}
+        for condition, levels in keywords.items():
+            for level, words in levels.items():
+                for word in words:
+                    hits.setdefault(word.casefold(), set()).add((condition, level, word.casefold()))
+        self._keyword_groups = [
+            (anchor, [(word, hits[word]) for word in words]) for anchor, words in _anchor_groups(hits)
+        ]
+
+        lab_names = {alias: name for name, (aliases, _, _) in labs.items() for alias in aliases}
+        # anchor 마다 (anchor 의 위치, 검사 이름, 그 위치에서 바로 match 하는 정규식)
+        self._lab_groups = [
+            (anchor, [(alias.index(anchor), lab_names[alias], re.compile(re.escape(alias) + LAB_VALUE_PATTERN))
+                      for alias in aliases])
+            for anchor, aliases in _anchor_groups(lab_names)
+        ]
+        self._target_re = re.compile("|".join(map(re.escape, TARGET_WORDS)))
+
+    def lab_values(self, note):
+        """{lab: (comparator, value)} for every measured lab value found (the
+        last one wins); comparator is None for a plain value."""
+        return self._lab_values(note.casefold())
+
+    def scan(self, note):
+        """{condition: score} for the conditions with at least one finding."""
+        text = note.casefold()
+        found = set()
+        for anchor, words in self._keyword_groups:
+            # 대부분의 anchor 는 메모에 없으므로 묶음 전체를 `in` 한 번으로 건너뜀
+            if anchor in text:
+                for word, hits in words:
+                    if word == anchor or word in text:
+                        found |= hits
+
+        scores = {}
+        for condition, level, _ in found:
+            scores[condition] = scores.get(condition, 0) + LEVEL_SCORES[level]
+        for lab, (comparator, value) in self._lab_values(text).items():
+            _, condition, bands = self.labs[lab]
+            level = _grade(value, bands, comparator)
+            if level is not None:
+                scores[condition] = scores.get(condition, 0) + LEVEL_SCORES[level]
+        return {condition: scores[condition] for condition in self.conditions if condition in scores}
+
+    def _lab_values(self, text):
+        matches = []
+        for anchor, aliases in self._lab_groups:
+            position = text.find(anchor)
+            while position != -1:
+                for offset, lab, pattern in aliases:
+                    start = position - offset
+                    # 영문 약어는 앞뒤가 영문자가 아닐 때만 (예: "before" 안의 "ef", "hba1c" 안의 "a1c" 는 제외)
+                    if start < 0 or (start and "a" <= text[start - 1] <= "z"):
+                        continue
+                    match = pattern.match(text, start)
+                    if match is None:
+                        continue
+                    between, comparator, value = match.groups()
+                    # "목표 HbA1c <7%", "HbA1c 목표 <7%" 모두 목표치
+                    if self._target_re.search(text[max(0, start - 12):start] + between) is None:
+                        matches.append((start, lab, comparator, value))
+                position = text.find(anchor, position + 1)
+        values = {}
+        for _, lab, comparator, value in sorted(matches):
+            values[lab] = (COMPARATORS.get(comparator, comparator), float(value))
+        return values
+
+
+def _anchor_groups(words, length=ANCHOR_LENGTH):
+    """[(anchor, [word])] covering every word.
+
+    Greedily takes the substring of `length` characters (HANGUL_ANCHOR_LENGTH
+    for Korean, or a whole shorter word) shared by the most remaining words,
+    then lengthens it to the longest substring all of those words share,
+    since str.find skips ahead faster with a longer needle.
+    """
+    groups = []
+    uncovered = set(words)
+    while uncovered:
+        counts = {}
+        for word in uncovered:
+            size = min(len(word), length if word.isascii() else HANGUL_ANCHOR_LENGTH)
+            for part in {word[i:i + size] for i in range(len(word) - size + 1)}:
+                counts[part] = counts.get(part, 0) + 1
+        for part in counts:
+            # 짧은 영문 단어("ef")는 더 긴 단어("lvef") 안에도 있으므로 직접 센다
+            if part.isascii() and len(part) < length:
+                counts[part] = sum(1 for word in uncovered if part in word)
+        anchor = max(sorted(counts), key=lambda part: (counts[part], len(part)))
+        covered = sorted(word for word in uncovered if anchor in word)
+        shortest = min(covered, key=len)
+        anchor = next(
+            part
+            for size in range(len(shortest), len(anchor) - 1, -1)
+            for part in (shortest[i:i + size] for i in range(len(shortest) - size + 1))
+            if all(part in word for word in covered)
+        )
+        groups.append((anchor, covered))
+        uncovered.difference_update(covered)
+    return groups
+
+
+def _grade(value, bands, comparator=None):
+    for low, high, level in bands:
+        if comparator == "<":
+            # "<40" 은 40 미만 -> 최대값이 40 인 구간 (최대값은 구간에 포함되지 않으므로)
+            inside = (low is None or value > low) and (high is None or value <= high)
+        else:
+            # ">9" 는 최소값 9 가 포함되는 구간과 같고, "<=" / ">=" 는 값 그대로
+            inside = (low is None or value >= low) and (high is None or value < high)
+        if inside:
+            return level
+    return None
+
+
+_default_scanner = RiskScanner()
+
+
+def score_risks(note):
+    """{condition: score} for one note, using the shared default scanner."""
+    return _default_scanner.scan(note)
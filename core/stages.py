@@ -0,0 +1,65 @@
+import threading
+import time
+from contextlib import contextmanager
+
+
+class StageTracker:
+    """Records how long each pipeline stage of one report took.
+
+    `expected` lists the stages the report will go through so progress can be
+    reported as a fraction; `on_progress(fraction, name)` is called whenever a
+    stage finishes. Stages may start and finish on different threads; pass
+    `at` (a time.perf_counter() value) when the event happened elsewhere
+    before it reached the tracker.
+    """
+
+    def __init__(self, expected=(), on_progress=None):
+        self.expected = list(expected)
+        self.on_progress = on_progress
+        self.durations = {}
+        self.created = time.perf_counter()
+        self._started = {}
+        self._lock = threading.Lock()
+
+    def start(self, name, at=None):
+        with self._lock:
+            self._started[name] = time.perf_counter() if at is None else at
+
+    def finish(self, name, at=None):
+        with self._lock:
+            started = self._started.pop(name, None)
+            if started is None:
+                return
+            self.durations[name] = (time.perf_counter() if at is None else at) - started
+            fraction = self.fraction
+        if self.on_progress is not None:
+            self.on_progress(fraction, name)
+
+    @contextmanager
+    def stage(self, name):
+        self.start(name)
+        try:
+            yield
+        finally:
+            self.finish(name)
+
+    def skip(self, names):
+        # 캐시 적중 등으로 실행하지 않는 단계는 진행률 계산에서 제외
+        with self._lock:
+            self.expected = [name for name in self.expected if name not in names]
+
+    @property
+    def fraction(self):
+        if not self.expected:
+            return 1.0
+        return min(1.0, sum(1 for name in self.expected if name in self.durations) / len(self.expected))
+
+    @property
+    def elapsed(self):
+        # LLM 단계는 서로 겹치므로 단계 합계가 아닌 실제 경과 시간
+        return time.perf_counter() - self.created
+
+    def summary(self):
+        """Return [(stage, seconds)] in the order the stages finished."""
+        with self._lock:
+            return list(self.durations.items())
@@ -0,0 +1,45 @@
+import re
+from functools import lru_cache
+
+from core.languages import LANGUAGE_PROFILES
+
+# --- Helper: sanitize text for Streamlit & PDF ---
+# 리포트 폰트(DejaVu / NotoSansKR)로 출력할 수 있는 문자만 남기고 나머지는 공백으로
+SAFE_CHARS = (
+    "\u0000-\u007F"  # ASCII
+    "\uAC00-\uD7AF"  # 한글 음절
+    "\u1100-\u11FF\u3130-\u318F\uA960-\uA97F\uD7B0-\uD7FF"  # 한글 자모 (ㄱ, ㅋㅋ 등)
+    "‘’“”"  # 둥근 따옴표
+    "•·–—…"  # 글머리 기호, 가운뎃점, 대시, 말줄임표
+    "°±×≤≥"  # 검사 수치에 쓰이는 °, ±, ×, ≤, ≥
+)
+# 공백류/마이너스 기호는 지우지 않고 ASCII 로 바꿈
+REPLACEMENTS = {
+    "\u00A0": " ", "\u2009": " ", "\u202F": " ", "\u3000": " ",
+    "\u2212": "-", "\u2011": "-",
+}
+
+
+# 안전하지 않은 문자가 이어진 구간 단위로 매칭 (대부분의 출력은 매칭이 거의 없음)
+@lru_cache(maxsize=None)
+def _unsafe_re(lang):
+    extra = LANGUAGE_PROFILES[lang]["safe_chars"] if lang is not None else ""
+    return re.compile(f"[^{SAFE_CHARS}{extra}]+")
+
+
+def _replace(match):
+    return "".join(REPLACEMENTS.get(char, " ") for char in match.group())
+
+
+def sanitize_text(text, lang=None):
+    # 문자 단위 치환이라 스트리밍 청크마다 적용해도 전체에 적용한 것과 결과가 같음
+    # lang 을 주면 그 언어의 폰트로 출력할 수 있는 문자(한자, 키릴 문자 등)도 남김
+    if text.isascii():
+        return text
+    return _unsafe_re(lang).sub(_replace, text)
+
+
+# --- Helper: rough token count (토크나이저 없이 대략 추정: 영문은 약 4자당 1토큰, 한글 등은 글자당 1토큰) ---
+def estimate_tokens(text):
+    ascii_chars = sum(1 for char in text if ord(char) < 128)
+    return ascii_chars // 4 + (len(text) - ascii_chars) + 4
@@ -0,0 +1,126 @@
+"""HTTP API for programmatic report generation (e.g. EMR integration).
+
+    uvicorn service:app --host 0.0.0.0 --port 8000
+
+POST /reports                     submit a note, returns 202 with the job id
+GET  /reports/{job_id}            job status, and the sections once done
+GET  /reports/{job_id}/pdf/{lang} the rendered PDF for one language
+GET  /metrics                     token/cost usage per stage, language and model
+GET  /metrics.csv                 every recorded completion as CSV
+
+Reports run on a bounded worker pool (REPORT_API_WORKERS) behind a bounded
+queue (REPORT_API_MAX_QUEUE); when the queue is full the API answers 503.
+`languages` may list any language in core.languages whose fonts are
+installed; REPORT_LANGUAGES sets the default (eng,kor, minus any language
+whose fonts are missing).
+"""
+import os
+from contextlib import asynccontextmanager
+
+from dotenv import load_dotenv
+from fastapi import FastAPI, HTTPException, Response
+from pydantic import BaseModel, Field
+
+# core.pipeline / core.chunking 은 import 할 때 REPORT_LANGUAGES 등을 읽으므로 .env 를 먼저 불러옴
+load_dotenv()
+
+from core.cache import ReportCache
+from core.client import make_client
+from core.engine import GenerationEngine
+from core.jobs import JobQueue, QueueFull
+from core.metrics import MetricsStore
+from core.pipeline import LANGUAGES, SUPPORTED_LANGUAGES, calls_per_report, generate_report
+
+WORKERS = int(os.getenv("REPORT_API_WORKERS", 4))
+MAX_QUEUE = int(os.getenv("REPORT_API_MAX_QUEUE", 100))
+
+# 요청마다 언어가 다르고 엔진은 공유하므로, 지원하는 모든 언어를 요청해도 기다리지 않는 크기로
+# (연결 풀도 같은 크기로: 기본 클라이언트의 20 개로는 남는 워커가 PoolTimeout 으로 실패)
+ENGINE_WORKERS = WORKERS * calls_per_report(SUPPORTED_LANGUAGES)
+engine = GenerationEngine.from_env(client=make_client(max_connections=ENGINE_WORKERS), max_workers=ENGINE_WORKERS)
+cache = ReportCache.from_env()
+jobs = JobQueue(max_workers=WORKERS, max_pending=MAX_QUEUE)
+metrics = MetricsStore()
+
+
+@asynccontextmanager
+async def lifespan(app):
+    yield
+    jobs.shutdown()
+    engine.shutdown()
+
+
+app = FastAPI(title="Patient-Friendly AI Assistant API", lifespan=lifespan)
+
+
+class ReportRequest(BaseModel):
+    note: str = Field(min_length=1, description="Doctor's note (Korean or English)")
+    languages: list[str] = Field(default=list(LANGUAGES), description="Report languages")
+
+
+@app.get("/health")
+def health():
+    return {"status": "ok", "jobs": jobs.stats(), "cache": cache.stats()}
+
+
+@app.post("/reports", status_code=202)
+def submit_report(request: ReportRequest):
+    if not request.note.strip():
+        raise HTTPException(422, "note is empty")
+    unknown = [lang for lang in request.languages if lang not in SUPPORTED_LANGUAGES]
+    if unknown:
+        raise HTTPException(422, f"unsupported languages: {', '.join(unknown)}")
+    try:
+        job = jobs.submit(_generate, request.note, request.languages)
+    except QueueFull as e:
+        raise HTTPException(503, str(e), headers={"Retry-After": "30"})
+    return {**job.to_dict(), "status_url": f"/reports/{job.id}"}
+
+
+@app.get("/metrics")
+def usage_metrics():
+    return {"summary": metrics.summary(), "by_stage": metrics.by("stage", "language", "model")}
+
+
+@app.get("/metrics.csv")
+def usage_metrics_csv():
+    return Response(metrics.to_csv(), media_type="text/csv")
+
+
+@app.get("/reports/{job_id}")
+def report_status(job_id: str):
+    job = _get_job(job_id)
+    body = job.to_dict()
+    if job.status == "done":
+        report = job.result
+        body["sections"] = report.sections
+        body["cached"] = report.cached
+        body["pdf_urls"] = {lang: f"/reports/{job.id}/pdf/{lang}" for lang in report.pdfs}
+    return body
+
+
+@app.get("/reports/{job_id}/pdf/{lang}")
+def report_pdf(job_id: str, lang: str):
+    job = _get_job(job_id)
+    if job.status != "done":
+        raise HTTPException(409, f"report is {job.status}")
+    if lang not in job.result.pdfs:
+        raise HTTPException(404, f"no {lang} PDF for this report")
+    return Response(
+        job.result.pdfs[lang],
+        media_type="application/pdf",
+        headers={"Content-Disposition": f'attachment; filename="patient_report_{lang}.pdf"'},
+    )
+
+
+def _generate(note, languages):
+    report = generate_report(note, languages=languages, engine=engine, cache=cache)
+    metrics.record_report(report, engine.model, source="api")
+    return report
+
+
+def _get_job(job_id):
+    job = jobs.get(job_id)
+    if job is None:
+        raise HTTPException(404, "unknown report id")
+    return job